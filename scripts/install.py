@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
 """Installation script for ytdl-helper."""
 
+import importlib
+import shutil
+import site
 import subprocess
 import sys
+import sysconfig
 from pathlib import Path
+from typing import List
 
 
-def run_command(command: str, description: str) -> bool:
+def run_command(command: List[str], description: str) -> bool:
     """Run a command and return success status."""
     print(f"📦 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -30,17 +35,17 @@ def main() -> None:
     
     print(f"✅ Python {sys.version_info.major}.{sys.version_info.minor} detected")
     
-    # Install dependencies
-    commands = [
-        ("pip install --upgrade pip", "Upgrading pip"),
-        ("pip install -e .", "Installing ytdl-helper"),
-    ]
-    
-    for command, description in commands:
-        if not run_command(command, description):
-            print(f"❌ Installation failed at: {description}")
-            sys.exit(1)
+    # Upgrade pip and install the package with a single pip run
+    description = "Upgrading pip and installing ytdl-helper"
+    command = [sys.executable, "-m", "pip", "install", "--upgrade", "pip", "-e", "."]
+    if not run_command(command, description):
+        print(f"❌ Installation failed at: {description}")
+        sys.exit(1)
     
+    # Pick up the freshly installed editable package in this interpreter
+    site.addsitedir(sysconfig.get_paths()["purelib"])
+    importlib.invalidate_caches()
+
     # Verify installation
     print("🔍 Verifying installation...")
     try:
@@ -50,17 +55,17 @@ def main() -> None:
         print(f"❌ Installation verification failed: {e}")
         sys.exit(1)
     
-    # Test CLI
-    try:
-        result = subprocess.run(
-            ["ytdl-helper", "--help"], 
-            capture_output=True, 
-            text=True, 
-            check=True
-        )
+    # Test CLI in-process instead of spawning another interpreter
+    from typer.testing import CliRunner
+    from ytdl_helper.cli import app
+
+    result = CliRunner().invoke(app, ["--help"])
+    if result.exit_code == 0:
         print("✅ CLI command works correctly")
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
-        print(f"❌ CLI verification failed: {e}")
+    else:
+        print(f"❌ CLI verification failed: {result.output or result.exception}")
+
+    if shutil.which("ytdl-helper") is None:
         print("Note: You may need to restart your terminal or add the installation directory to PATH")
     
     print("\n🎉 Installation completed!")
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Script para configurar la carpeta de descarga de ytdl-helper."""
 
-import os
 import sys
 from pathlib import Path
 
@@ -16,7 +15,8 @@ def main():
     download_dir = project_dir / "download"
     
     # Crear la carpeta si no existe
-    download_dir.mkdir(exist_ok=True)
+    if not download_dir.exists():
+        download_dir.mkdir()
     print(f"✅ Carpeta de descarga creada: {download_dir}")
     
     # Crear archivo .env si no existe
@@ -32,8 +32,7 @@ def main():
 # YTDL_METADATA__WRITE_INFO_JSON=true
 # YTDL_METADATA__WRITE_THUMBNAIL=true
 """
-        with open(env_file, "w", encoding="utf-8") as f:
-            f.write(env_content)
+        env_file.write_text(env_content, encoding="utf-8")
         print(f"✅ Archivo .env creado: {env_file}")
         print("ℹ️  Para usar configuración desde .env, descomenta las líneas necesarias")
     else:
@@ -42,12 +41,10 @@ def main():
     # Verificar .gitignore
     gitignore_file = project_dir / ".gitignore"
     if gitignore_file.exists():
-        with open(gitignore_file, "r", encoding="utf-8") as f:
-            content = f.read()
-            if "download/" in content:
-                print("✅ Carpeta 'download/' ya está en .gitignore")
-            else:
-                print("⚠️  Carpeta 'download/' no encontrada en .gitignore")
+        if "download/" in gitignore_file.read_text(encoding="utf-8"):
+            print("✅ Carpeta 'download/' ya está en .gitignore")
+        else:
+            print("⚠️  Carpeta 'download/' no encontrada en .gitignore")
     
     print("\n🎉 Configuración completada!")
     print("\nPara usar la carpeta de descarga configurada:")
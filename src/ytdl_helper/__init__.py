@@ -1,12 +1,31 @@
 """YTDL Helper - A CLI tool for downloading videos with yt-dlp."""
 
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 __author__ = "YTDL Helper Team"
 __email__ = "team@ytdl-helper.dev"
 
-from ytdl_helper.cli import app
-from ytdl_helper.core import VideoDownloader
-from ytdl_helper.config import Settings
+if TYPE_CHECKING:
+    from ytdl_helper.cli import app
+    from ytdl_helper.config import Settings
+    from ytdl_helper.core import VideoDownloader
 
 __all__ = ["app", "VideoDownloader", "Settings"]
 
+
+def __getattr__(name: str) -> Any:
+    """Lazily import the public API so importing the package stays cheap."""
+    if name == "app":
+        from ytdl_helper.cli import app
+
+        return app
+    if name == "VideoDownloader":
+        from ytdl_helper.core import VideoDownloader
+
+        return VideoDownloader
+    if name == "Settings":
+        from ytdl_helper.config import Settings
+
+        return Settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,101 @@
+"""Persistent on-disk cache for extracted video metadata."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "ytdl-helper" / "meta.sqlite"
+
+
+class MetadataCache:
+    """SQLite-backed cache of yt-dlp info dictionaries keyed by URL."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl: int = 3600) -> None:
+        """Initialize cache; the database is only opened on first use."""
+        self.path = path
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Get the cache key for a URL."""
+        return hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating it if needed."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "key TEXT PRIMARY KEY, created REAL NOT NULL, data BLOB NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get cached info for a URL, or None if missing or expired."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT created, data FROM metadata WHERE key = ?",
+                    (self.key_for(url),),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Metadata cache read failed: {str(e)}")
+            return None
+
+        if row is None:
+            return None
+
+        created, data = row
+        if time.time() - created > self.ttl:
+            return None
+
+        try:
+            result: Dict[str, Any] = orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Metadata cache entry unreadable: {str(e)}")
+            return None
+        return result
+
+    def set(self, url: str, info: Dict[str, Any]) -> None:
+        """Store info for a URL; unserializable info is skipped."""
+        try:
+            data = orjson.dumps(info, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError as e:
+            logger.warning(f"Metadata not cacheable: {str(e)}")
+            return
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO metadata (key, created, data) VALUES (?, ?, ?)",
+                        (self.key_for(url), time.time(), data),
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Metadata cache write failed: {str(e)}")
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM metadata")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,17 +1,30 @@
 """Command Line Interface using Typer."""
 
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Annotated, List, Optional
+from typing import TYPE_CHECKING, Annotated, Any, Dict, Iterator, Optional, Tuple, Type
 
 import typer
-from rich.console import Console
 from rich.prompt import Confirm, Prompt
 
-from ytdl_helper.config import Settings
-from ytdl_helper.core import VideoDownloader, DownloadError, RightsError
-from ytdl_helper.tui import InteractiveTUI
-from ytdl_helper.utils import validate_url, print_error, print_success, print_warning
+from ytdl_helper.utils import (
+    get_console,
+    normalize_url,
+    print_error,
+    print_success,
+    print_warning,
+    validate_url,
+)
+
+# Settings, the downloader and the TUI pull in pydantic and yt-dlp, so they
+# are imported inside the commands that need them to keep --help and
+# version fast.
+if TYPE_CHECKING:
+    from ytdl_helper.cache import MetadataCache
+    from ytdl_helper.config import Settings
+    from ytdl_helper.core import VideoInfo
+    from ytdl_helper.tui import InteractiveTUI
 
 app = typer.Typer(
     name="ytdl-helper",
@@ -20,8 +33,88 @@ app = typer.Typer(
     rich_markup_mode="rich",
 )
 
-console = Console()
-tui = InteractiveTUI(console)
+console = get_console()
+_tui: Optional["InteractiveTUI"] = None
+_welcome_shown = False
+
+METADATA_CACHE_FILE = "meta.sqlite"
+
+
+def _get_tui() -> "InteractiveTUI":
+    """Get the shared TUI, creating it on first use."""
+    global _tui
+    if _tui is None:
+        from ytdl_helper.tui import InteractiveTUI
+
+        _tui = InteractiveTUI(console)
+    return _tui
+
+
+def _show_welcome_once() -> None:
+    """Show the welcome banner once per process, and only on a terminal."""
+    global _welcome_shown
+    if _welcome_shown or not console.is_terminal:
+        return
+
+    _get_tui().show_welcome()
+    _welcome_shown = True
+
+
+def _report_error(message: str, details: Optional[str] = None, quiet: bool = False) -> None:
+    """Render an error once: a TUI panel, or a single line when quiet."""
+    if quiet:
+        print_error(f"{message}: {details}" if details else message)
+        return
+
+    tui = _get_tui()
+    tui.progress.stop()
+    tui.show_error(message, details)
+
+
+@contextmanager
+def _cli_error_scope(
+    failure: str,
+    quiet: bool = False,
+    failure_types: Optional[Tuple[Type[Exception], ...]] = None,
+) -> Iterator[None]:
+    """Report errors raised by a command body and exit with status 1.
+
+    ``failure`` labels errors of ``failure_types`` (``DownloadError`` by
+    default); any other exception is reported as unexpected.
+    """
+    from ytdl_helper.core import DownloadError, RightsError
+
+    try:
+        yield
+    except typer.Exit:
+        raise
+    except RightsError as e:
+        _report_error(str(e), quiet=quiet)
+    except KeyboardInterrupt:
+        _report_error("Cancelled by user", quiet=quiet)
+    except Exception as e:
+        if isinstance(e, failure_types or (DownloadError,)):
+            _report_error(failure, str(e), quiet)
+        else:
+            _report_error("Unexpected error", str(e), quiet)
+    else:
+        return
+    raise typer.Exit(1)
+
+
+def _metadata_cache(settings: "Settings", no_cache: bool = False) -> Optional["MetadataCache"]:
+    """Get the on-disk metadata cache for these settings, unless disabled."""
+    if no_cache:
+        return None
+
+    from ytdl_helper.cache import MetadataCache
+
+    return MetadataCache(settings.cache_dir / METADATA_CACHE_FILE, ttl=settings.cache_ttl)
+
+
+def _report_entry_error(entry_url: str, error: Exception) -> None:
+    """Report a playlist entry that failed to download."""
+    print_error(f"Failed to download {entry_url}: {str(error)}")
 
 
 @app.command()
@@ -48,9 +141,16 @@ def download(
     metadata: Annotated[bool, typer.Option(
         "--metadata", "-m", help="Save metadata and thumbnail"
     )] = False,
+    concurrency: Annotated[Optional[int], typer.Option(
+        "--concurrency", "-j", min=1,
+        help="Number of playlist items to download in parallel (default: 4)"
+    )] = None,
     skip_rights_check: Annotated[bool, typer.Option(
         "--skip-rights-check", help="Skip rights confirmation (not recommended)"
     )] = False,
+    no_cache: Annotated[bool, typer.Option(
+        "--no-cache", help="Bypass the cached video metadata"
+    )] = False,
     verbose: Annotated[bool, typer.Option(
         "--verbose", "-v", help="Verbose output"
     )] = False,
@@ -59,14 +159,18 @@ def download(
     )] = False,
 ) -> None:
     """Download a video or audio from URL."""
-    try:
+    from ytdl_helper.config import get_base_settings
+    from ytdl_helper.core import VideoDownloader
+
+    tui = _get_tui()
+    with _cli_error_scope("Download failed", quiet):
         # Validate URL
         if not validate_url(url):
             print_error("Invalid URL provided")
             raise typer.Exit(1)
 
         # Create settings
-        settings = Settings()
+        settings = get_base_settings().model_copy(deep=True)
         settings.verbose = verbose
         settings.quiet = quiet
         settings.user.skip_rights_check = skip_rights_check
@@ -85,42 +189,40 @@ def download(
             settings.metadata.write_thumbnail = True
 
         # Create downloader
-        downloader = VideoDownloader(settings)
+        downloader = VideoDownloader(settings, _metadata_cache(settings, no_cache))
 
         # Set up progress callback
-        def progress_callback(data: dict) -> None:
+        def progress_callback(data: Dict[str, Any]) -> None:
             if not quiet:
                 tui.progress.update_progress(data)
 
         downloader.set_progress_callback(progress_callback)
 
-        # Check if it's a playlist
-        if playlist or downloader.get_video_info(url).is_playlist:
+        # Check if it's a playlist; the fetched info is reused below
+        video_info = None if playlist else downloader.get_video_info(url)
+
+        if video_info is None or video_info.is_playlist:
             if not playlist:
                 print_warning("URL appears to be a playlist. Use --playlist flag to download.")
                 raise typer.Exit(1)
             
             # Download playlist
             if not quiet:
-                tui.show_welcome()
+                _show_welcome_once()
                 tui.progress.start_download("Playlist")
             
-            try:
-                downloaded_files = downloader.download_playlist(url, max_items)
-                if not quiet:
-                    tui.progress.finish_download()
-                    tui.info_display.show_download_summary(downloaded_files)
-                print_success(f"Downloaded {len(downloaded_files)} files from playlist")
-            except RightsError as e:
-                if not quiet:
-                    tui.progress.show_error(str(e))
-                print_error(str(e))
-                raise typer.Exit(1)
+            entry_urls = downloader.get_playlist_entries(url, max_items=max_items)
+            downloaded_files = downloader.download_entries(
+                entry_urls, concurrency, on_error=_report_entry_error
+            )
+            if not quiet:
+                tui.progress.finish_download()
+                tui.info_display.show_download_summary(downloaded_files)
+            print_success(f"Downloaded {len(downloaded_files)} files from playlist")
         else:
             # Download single video
             if not quiet:
-                tui.show_welcome()
-                video_info = downloader.get_video_info(url)
+                _show_welcome_once()
                 tui.info_display.show_video_info(video_info)
                 tui.info_display.show_rights_warning()
                 
@@ -130,33 +232,15 @@ def download(
                 
                 tui.progress.start_download(video_info.title)
             
-            try:
-                downloaded_file = downloader.download_single(url)
-                if not quiet:
-                    tui.progress.finish_download()
-                    tui.info_display.show_download_summary([downloaded_file])
-                print_success(f"Downloaded: {downloaded_file}")
-            except RightsError as e:
-                if not quiet:
-                    tui.progress.show_error(str(e))
-                print_error(str(e))
-                raise typer.Exit(1)
-
-    except DownloadError as e:
-        if not quiet:
-            tui.show_error("Download failed", str(e))
-        print_error(f"Download failed: {str(e)}")
-        raise typer.Exit(1)
-    except KeyboardInterrupt:
-        if not quiet:
-            tui.show_error("Download cancelled by user")
-        print_error("Download cancelled by user")
-        raise typer.Exit(1)
-    except Exception as e:
-        if not quiet:
-            tui.show_error("Unexpected error", str(e))
-        print_error(f"Unexpected error: {str(e)}")
-        raise typer.Exit(1)
+            # Rights were already confirmed above unless running quietly, and
+            # the fetched info is downloaded without a second extraction
+            downloaded_file = downloader.download_single(
+                url, rights_confirmed=not quiet, video_info=video_info
+            )
+            if not quiet:
+                tui.progress.finish_download()
+                tui.info_display.show_download_summary([downloaded_file])
+            print_success(f"Downloaded: {downloaded_file}")
 
 
 @app.command()
@@ -165,41 +249,38 @@ def info(
     formats: Annotated[bool, typer.Option(
         "--formats", "-f", help="Show available formats"
     )] = False,
+    no_cache: Annotated[bool, typer.Option(
+        "--no-cache", help="Bypass the cached video metadata"
+    )] = False,
     verbose: Annotated[bool, typer.Option(
         "--verbose", "-v", help="Verbose output"
     )] = False,
 ) -> None:
     """Get information about a video."""
-    try:
+    from ytdl_helper.config import get_base_settings
+    from ytdl_helper.core import VideoDownloader
+
+    tui = _get_tui()
+    with _cli_error_scope("Failed to get video information"):
         # Validate URL
         if not validate_url(url):
             print_error("Invalid URL provided")
             raise typer.Exit(1)
 
         # Create downloader
-        settings = Settings()
+        settings = get_base_settings().model_copy(deep=True)
         settings.verbose = verbose
-        downloader = VideoDownloader(settings)
+        downloader = VideoDownloader(settings, _metadata_cache(settings, no_cache))
 
         # Get video info
         video_info = downloader.get_video_info(url)
         
         # Display information
-        tui.show_welcome()
+        _show_welcome_once()
         tui.info_display.show_video_info(video_info)
         
         if formats:
-            available_formats = downloader.list_formats(url)
-            tui.info_display.show_formats_table(available_formats)
-
-    except DownloadError as e:
-        tui.show_error("Failed to get video information", str(e))
-        print_error(f"Failed to get video information: {str(e)}")
-        raise typer.Exit(1)
-    except Exception as e:
-        tui.show_error("Unexpected error", str(e))
-        print_error(f"Unexpected error: {str(e)}")
-        raise typer.Exit(1)
+            tui.info_display.show_format_rows(video_info.format_rows)
 
 
 @app.command()
@@ -229,9 +310,16 @@ def playlist(
     metadata: Annotated[bool, typer.Option(
         "--metadata", "-m", help="Save metadata and thumbnail"
     )] = False,
+    concurrency: Annotated[Optional[int], typer.Option(
+        "--concurrency", "-j", min=1,
+        help="Number of playlist items to download in parallel (default: 4)"
+    )] = None,
     skip_rights_check: Annotated[bool, typer.Option(
         "--skip-rights-check", help="Skip rights confirmation (not recommended)"
     )] = False,
+    no_cache: Annotated[bool, typer.Option(
+        "--no-cache", help="Bypass the cached video metadata"
+    )] = False,
     verbose: Annotated[bool, typer.Option(
         "--verbose", "-v", help="Verbose output"
     )] = False,
@@ -240,14 +328,18 @@ def playlist(
     )] = False,
 ) -> None:
     """Download a playlist from URL."""
-    try:
+    from ytdl_helper.config import get_base_settings
+    from ytdl_helper.core import VideoDownloader
+
+    tui = _get_tui()
+    with _cli_error_scope("Download failed", quiet):
         # Validate URL
         if not validate_url(url):
             print_error("Invalid URL provided")
             raise typer.Exit(1)
 
         # Create settings
-        settings = Settings()
+        settings = get_base_settings().model_copy(deep=True)
         settings.verbose = verbose
         settings.quiet = quiet
         settings.user.skip_rights_check = skip_rights_check
@@ -266,10 +358,10 @@ def playlist(
             settings.metadata.write_thumbnail = True
 
         # Create downloader
-        downloader = VideoDownloader(settings)
+        downloader = VideoDownloader(settings, _metadata_cache(settings, no_cache))
 
         # Set up progress callback
-        def progress_callback(data: dict) -> None:
+        def progress_callback(data: Dict[str, Any]) -> None:
             if not quiet:
                 tui.progress.update_progress(data)
 
@@ -277,7 +369,7 @@ def playlist(
 
         # Get playlist info first
         if not quiet:
-            tui.show_welcome()
+            _show_welcome_once()
             
         playlist_info = downloader.get_video_info(url)
         
@@ -295,41 +387,25 @@ def playlist(
                 
             tui.progress.start_download(f"Playlist: {playlist_info.title}")
         
-        try:
-            downloaded_files = downloader.download_playlist(
-                url, 
-                max_items=max_items,
-                start_item=start_item,
-                end_item=end_item
-            )
-            
-            if not quiet:
-                tui.progress.finish_download()
-                tui.info_display.show_download_summary(downloaded_files)
-                
-            print_success(f"Downloaded {len(downloaded_files)} files from playlist")
-            
-        except RightsError as e:
-            if not quiet:
-                tui.progress.show_error(str(e))
-            print_error(str(e))
-            raise typer.Exit(1)
+        # The playlist was fetched and, unless quiet, its rights confirmed above
+        entry_urls = downloader.get_playlist_entries(
+            url,
+            start_item=start_item,
+            end_item=end_item,
+            max_items=max_items,
+            video_info=playlist_info,
+            rights_confirmed=not quiet,
+        )
+        downloaded_files = downloader.download_entries(
+            entry_urls, concurrency, on_error=_report_entry_error
+        )
 
-    except DownloadError as e:
-        if not quiet:
-            tui.show_error("Download failed", str(e))
-        print_error(f"Download failed: {str(e)}")
-        raise typer.Exit(1)
-    except KeyboardInterrupt:
-        if not quiet:
-            tui.show_error("Download cancelled by user")
-        print_error("Download cancelled by user")
-        raise typer.Exit(1)
-    except Exception as e:
         if not quiet:
-            tui.show_error("Unexpected error", str(e))
-        print_error(f"Unexpected error: {str(e)}")
-        raise typer.Exit(1)
+            tui.progress.finish_download()
+            tui.info_display.show_download_summary(downloaded_files)
+
+        print_success(f"Downloaded {len(downloaded_files)} files from playlist")
+
 
 
 @app.command()
@@ -343,46 +419,73 @@ def config(
     config_file: Annotated[Optional[Path], typer.Option(
         "--config-file", "-c", help="Configuration file path"
     )] = None,
+    clear_cache: Annotated[bool, typer.Option(
+        "--clear-cache", help="Clear cached video metadata"
+    )] = False,
 ) -> None:
     """Manage configuration settings."""
-    try:
+    from ytdl_helper.config import get_base_settings
+
+    with _cli_error_scope("Configuration error", failure_types=(Exception,)):
         if show:
-            settings = Settings()
+            settings = get_base_settings()
             console.print("[bold blue]Current Configuration:[/bold blue]")
-            console.print(settings.model_dump_json(indent=2))
+            console.print_json(data=settings.model_dump(mode="json"))
         
         elif reset:
-            settings = Settings()
+            settings = get_base_settings()
             config_path = config_file or Path.home() / ".config" / "ytdl-helper" / "config.json"
             config_path.parent.mkdir(parents=True, exist_ok=True)
             settings.save_to_file(config_path)
             print_success(f"Configuration reset to defaults and saved to {config_path}")
+
+        elif clear_cache:
+            settings = get_base_settings()
+            from ytdl_helper.cache import MetadataCache
+
+            cache = MetadataCache(settings.cache_dir / METADATA_CACHE_FILE)
+            cache.clear()
+            cache.close()
+            print_success("Metadata cache cleared")
         
         else:
-            tui.show_help()
+            _get_tui().show_help()
             console.print("\n[bold]Configuration Options:[/bold]")
             console.print("• Use --show to display current configuration")
             console.print("• Use --reset to reset configuration to defaults")
+            console.print("• Use --clear-cache to clear cached video metadata")
             console.print("• Environment variables: YTDL_* (e.g., YTDL_OUTPUT_DIR)")
 
-    except Exception as e:
-        tui.show_error("Configuration error", str(e))
-        print_error(f"Configuration error: {str(e)}")
-        raise typer.Exit(1)
-
 
 @app.command()
-def interactive() -> None:
+def interactive(
+    no_cache: Annotated[bool, typer.Option(
+        "--no-cache", help="Bypass the cached video metadata"
+    )] = False,
+) -> None:
     """Start interactive mode."""
+    from ytdl_helper.config import get_base_settings
+    from ytdl_helper.core import VideoDownloader
+
+    tui = _get_tui()
     try:
-        tui.show_welcome()
+        _show_welcome_once()
         tui.show_help()
         
+        settings = get_base_settings().model_copy(deep=True)
+        downloader = VideoDownloader(settings, _metadata_cache(settings, no_cache))
+        downloader.set_progress_callback(tui.progress.update_progress)
+        default_extract_audio = settings.download.extract_audio
+        default_write_info_json = settings.metadata.write_info_json
+        default_write_thumbnail = settings.metadata.write_thumbnail
+        # Info fetched this session, so repeated actions on a URL skip yt-dlp
+        session_cache: Dict[str, "VideoInfo"] = {}
+        
         while True:
             console.print("\n[bold blue]Interactive Mode[/bold blue]")
             
             # Get URL from user
-            url = Prompt.ask("Enter video URL (or 'quit' to exit)")
+            url = Prompt.ask("Enter video URL (or 'quit' to exit)", console=console)
             
             if url.lower() in ['quit', 'exit', 'q']:
                 console.print("[green]Goodbye![/green]")
@@ -396,7 +499,8 @@ def interactive() -> None:
             action = Prompt.ask(
                 "What would you like to do?",
                 choices=["info", "download", "formats", "back"],
-                default="info"
+                default="info",
+                console=console,
             )
             
             if action == "back":
@@ -404,60 +508,54 @@ def interactive() -> None:
             
             # Get video info
             try:
-                settings = Settings()
-                downloader = VideoDownloader(settings)
-                video_info = downloader.get_video_info(url)
+                cache_key = normalize_url(url)
+                video_info = session_cache.get(cache_key)
+                if video_info is None:
+                    with tui.show_loading("Extracting video information..."):
+                        video_info = downloader.get_video_info(url)
+                    session_cache[cache_key] = video_info
                 
                 if action == "info":
                     tui.info_display.show_video_info(video_info)
                 
                 elif action == "formats":
-                    formats = downloader.list_formats(url)
-                    tui.info_display.show_formats_table(formats)
+                    tui.info_display.show_format_rows(video_info.format_rows)
                 
                 elif action == "download":
                     tui.info_display.show_video_info(video_info)
                     tui.info_display.show_rights_warning()
                     
                     if downloader.validate_rights(video_info):
-                        audio_only = Confirm.ask("Extract audio only?", default=False)
-                        save_metadata = Confirm.ask("Save metadata and thumbnail?", default=False)
-                        
-                        if audio_only:
-                            settings.download.extract_audio = True
-                        if save_metadata:
-                            settings.metadata.write_info_json = True
-                            settings.metadata.write_thumbnail = True
-                        
-                        downloader.settings = settings
+                        audio_only = Confirm.ask("Extract audio only?", default=False, console=console)
+                        save_metadata = Confirm.ask("Save metadata and thumbnail?", default=False, console=console)
                         
-                        def progress_callback(data: dict) -> None:
-                            tui.progress.update_progress(data)
+                        # Settings are shared across prompts, so apply every override
+                        settings.download.extract_audio = audio_only or default_extract_audio
+                        settings.metadata.write_info_json = save_metadata or default_write_info_json
+                        settings.metadata.write_thumbnail = save_metadata or default_write_thumbnail
                         
-                        downloader.set_progress_callback(progress_callback)
                         tui.progress.start_download(video_info.title)
                         
                         try:
-                            downloaded_file = downloader.download_single(url)
+                            downloaded_file = downloader.download_single(
+                                url, rights_confirmed=True
+                            )
                             tui.progress.finish_download()
                             tui.info_display.show_download_summary([downloaded_file])
                             print_success(f"Downloaded: {downloaded_file}")
                         except Exception as e:
-                            tui.progress.show_error(str(e))
-                            print_error(f"Download failed: {str(e)}")
+                            _report_error("Download failed", str(e))
                     
                     else:
                         print_error("Rights confirmation required")
 
             except Exception as e:
-                tui.show_error("Error", str(e))
-                print_error(f"Error: {str(e)}")
+                _report_error("Error", str(e))
 
     except KeyboardInterrupt:
         console.print("\n[green]Goodbye![/green]")
     except Exception as e:
-        tui.show_error("Interactive mode error", str(e))
-        print_error(f"Interactive mode error: {str(e)}")
+        _report_error("Interactive mode error", str(e))
 
 
 @app.command()
@@ -1,14 +1,63 @@
 """Configuration management using Pydantic Settings."""
 
+import copy
+import functools
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel, Field, field_validator
+import orjson
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Bumped on every public attribute assignment of any settings model, so
+# cached yt-dlp options notice edits to nested sections such as
+# ``settings.download.format``. In-place edits of list fields are not seen.
+_settings_generation = 0
 
-class DownloadSettings(BaseModel):
+
+# DownloadSettings fields passed to yt-dlp when set, as (field, option)
+_DOWNLOAD_OPTIONS = (
+    ("max_filesize", "max_filesize"),
+    ("max_duration", "max_duration"),
+    ("playlist_items", "playlist_items"),
+    ("playlist_start", "playliststart"),
+    ("playlist_end", "playlistend"),
+)
+
+# MetadataSettings flags enabling a yt-dlp option, as (field, option)
+_METADATA_FLAGS = (
+    ("write_info_json", "writeinfojson"),
+    ("write_thumbnail", "writethumbnail"),
+    ("write_description", "writedescription"),
+    ("write_annotations", "writeannotations"),
+    ("write_subtitles", "writesubtitles"),
+)
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create a directory if it does not exist, e.g. after being deleted."""
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+
+
+def _bump_generation() -> None:
+    """Invalidate cached yt-dlp options after a settings change."""
+    global _settings_generation
+    _settings_generation += 1
+
+
+class _TrackedModel(BaseModel):
+    """Base model that invalidates cached yt-dlp options on assignment."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute and record the change."""
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            _bump_generation()
+
+
+class DownloadSettings(_TrackedModel):
     """Settings for video/audio download."""
 
     format: str = Field(default="best", description="Download format")
@@ -25,13 +74,9 @@ class DownloadSettings(BaseModel):
     playlist_items: Optional[str] = Field(default=None, description="Playlist items to download")
     playlist_end: Optional[int] = Field(default=None, description="Last playlist item")
     playlist_start: Optional[int] = Field(default=1, description="First playlist item")
-
-    @field_validator("output_dir")
-    @classmethod
-    def validate_output_dir(cls, v: Path) -> Path:
-        """Ensure output directory exists."""
-        v.mkdir(parents=True, exist_ok=True)
-        return v
+    max_workers: int = Field(
+        default=4, ge=1, description="Playlist items downloaded in parallel"
+    )
 
     @field_validator("format")
     @classmethod
@@ -42,7 +87,7 @@ class DownloadSettings(BaseModel):
         return v
 
 
-class MetadataSettings(BaseModel):
+class MetadataSettings(_TrackedModel):
     """Settings for metadata extraction."""
 
     write_info_json: bool = Field(default=False, description="Write metadata to JSON file")
@@ -53,7 +98,7 @@ class MetadataSettings(BaseModel):
     subtitle_langs: List[str] = Field(default=["en"], description="Subtitle languages")
 
 
-class UserSettings(BaseModel):
+class UserSettings(_TrackedModel):
     """User confirmation and rights settings."""
 
     confirm_rights: bool = Field(default=True, description="Require rights confirmation")
@@ -94,16 +139,41 @@ class Settings(BaseSettings):
 
     # Cache and temporary files
     cache_dir: Path = Field(default_factory=lambda: Path.home() / ".cache" / "ytdl-helper")
+    cache_ttl: int = Field(default=3600, description="Metadata cache lifetime in seconds")
     temp_dir: Optional[Path] = Field(default=None, description="Temporary directory")
 
-    def model_post_init(self, __context: Any) -> None:
-        """Post-initialization setup."""
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        if self.temp_dir:
-            self.temp_dir.mkdir(parents=True, exist_ok=True)
+    _ytdlp_options: Optional[Tuple[int, Dict[str, Any]]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute and record the change."""
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            _bump_generation()
 
     def get_ytdlp_options(self) -> Dict[str, Any]:
-        """Get yt-dlp options dictionary."""
+        """Get yt-dlp options dictionary.
+
+        The result is cached until any settings model is modified; callers
+        get a copy, including nested lists and dicts such as
+        ``postprocessors``, that they may extend. Directories are created here,
+        on every call, rather than on construction.
+        """
+        _ensure_dir(self.download.output_dir)
+        _ensure_dir(self.cache_dir)
+        if self.temp_dir:
+            _ensure_dir(self.temp_dir)
+
+        cached = self._ytdlp_options
+        if cached is None or cached[0] != _settings_generation:
+            cached = (_settings_generation, self._build_ytdlp_options())
+            self._ytdlp_options = cached
+        return {
+            key: copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+            for key, value in cached[1].items()
+        }
+
+    def _build_ytdlp_options(self) -> Dict[str, Any]:
+        """Build the yt-dlp options dictionary from the current settings."""
         options = {
             "format": self.download.format,
             "outtmpl": str(self.download.output_dir / self.download.output_template),
@@ -127,32 +197,18 @@ class Settings(BaseSettings):
                 }],
             })
 
-        # File size and duration limits
-        if self.download.max_filesize:
-            options["max_filesize"] = self.download.max_filesize
-        if self.download.max_duration:
-            options["max_duration"] = self.download.max_duration
-
-        # Playlist settings
-        if self.download.playlist_items:
-            options["playlist_items"] = self.download.playlist_items
-        if self.download.playlist_start:
-            options["playliststart"] = self.download.playlist_start
-        if self.download.playlist_end:
-            options["playlistend"] = self.download.playlist_end
+        # File size, duration and playlist limits
+        for field, option in _DOWNLOAD_OPTIONS:
+            value = getattr(self.download, field)
+            if value:
+                options[option] = value
 
         # Metadata settings
-        if self.metadata.write_info_json:
-            options["writeinfojson"] = True
-        if self.metadata.write_thumbnail:
-            options["writethumbnail"] = True
-        if self.metadata.write_description:
-            options["writedescription"] = True
-        if self.metadata.write_annotations:
-            options["writeannotations"] = True
+        for field, option in _METADATA_FLAGS:
+            if getattr(self.metadata, field):
+                options[option] = True
         if self.metadata.write_subtitles:
-            options["writesubtitles"] = True
-            options["subtitleslangs"] = self.metadata.subtitle_langs
+            options["subtitleslangs"] = list(self.metadata.subtitle_langs)
 
         # Cache directory
         options["cachedir"] = str(self.cache_dir)
@@ -166,8 +222,9 @@ class Settings(BaseSettings):
 
     def save_to_file(self, file_path: Path) -> None:
         """Save settings to a JSON file."""
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(self.model_dump_json(indent=2))
+        file_path.write_bytes(
+            orjson.dumps(self.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+        )
 
     @classmethod
     def load_from_file(cls, file_path: Path) -> "Settings":
@@ -175,7 +232,13 @@ class Settings(BaseSettings):
         if not file_path.exists():
             return cls()
         
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = f.read()
-        return cls.model_validate_json(data)
+        return cls.model_validate(orjson.loads(file_path.read_bytes()))
+
+
+@functools.lru_cache(maxsize=1)
+def get_base_settings() -> Settings:
+    """Get the process-wide settings loaded from the environment.
 
+    Callers that mutate settings must work on ``model_copy(deep=True)``.
+    """
+    return Settings()
@@ -1,18 +1,57 @@
 """Core functionality for video downloading with yt-dlp."""
 
-import json
+import copy
+import functools
 import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
-import yt_dlp
-from rich.console import Console
+import orjson
+from rich.console import Group
+from rich.text import Text
 
+from ytdl_helper.cache import MetadataCache
 from ytdl_helper.config import Settings
-from ytdl_helper.utils import validate_url, confirm_rights
+from ytdl_helper.utils import (
+    build_format_rows,
+    confirm_rights,
+    get_console,
+    sanitize_filename,
+    validate_url,
+)
+
+# yt-dlp and requests are slow to import, so they are imported where used
+if TYPE_CHECKING:
+    import requests
 
 logger = logging.getLogger(__name__)
 
+THUMBNAIL_CHUNK_SIZE = 64 * 1024
+
+# Static part of the rights prompt, parsed once rather than on every prompt
+_RIGHTS_NOTICE = Group(
+    Text.from_markup(
+        "\n[yellow]Important:[/yellow] Only download content you own or have explicit permission to download."
+    ),
+    Text("This includes:"),
+    Text("• Your own videos"),
+    Text("• Content with Creative Commons license"),
+    Text("• Content with explicit permission from the copyright holder"),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _http_session() -> "requests.Session":
+    """Get the shared HTTP session, so connections are reused across thumbnails."""
+    import requests
+
+    return requests.Session()
+
 
 class DownloadError(Exception):
     """Custom exception for download errors."""
@@ -29,9 +68,31 @@ class RightsError(Exception):
 class VideoInfo:
     """Container for video information."""
 
+    # yt-dlp output is trusted and copied field by field without validation;
+    # slots keep the many per-entry instances of a playlist small.
+    __slots__ = (
+        "title",
+        "safe_title",
+        "duration",
+        "uploader",
+        "upload_date",
+        "view_count",
+        "description",
+        "thumbnail",
+        "url",
+        "formats",
+        "is_playlist",
+        "playlist_count",
+        "entries",
+        "raw",
+        "_format_rows",
+    )
+
     def __init__(self, info: Dict[str, Any]) -> None:
         """Initialize with yt-dlp info dictionary."""
         self.title = info.get("title", "Unknown")
+        # Filesystem-safe title for the metadata and thumbnail file names
+        self.safe_title = sanitize_filename(str(self.title))
         self.duration = info.get("duration", 0)
         self.uploader = info.get("uploader", "Unknown")
         self.upload_date = info.get("upload_date", "")
@@ -43,6 +104,18 @@ class VideoInfo:
         self.is_playlist = info.get("_type") == "playlist"
         self.playlist_count = info.get("playlist_count", 1)
         self.entries = info.get("entries", [])
+        # Kept so the info can be downloaded without extracting it again
+        self.raw = info
+        self._format_rows: Optional[List[Tuple[str, ...]]] = None
+
+    @property
+    def format_rows(self) -> List[Tuple[str, ...]]:
+        """Get display-ready format table rows, built on first access."""
+        rows = self._format_rows
+        if rows is None:
+            rows = build_format_rows(self.formats)
+            self._format_rows = rows
+        return rows
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -64,35 +137,80 @@ class VideoInfo:
         return f"Video: {self.title} by {self.uploader}"
 
 
-class ProgressHook:
-    """Progress hook for yt-dlp."""
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def _make_progress_hook(
+    progress_callback: Optional[ProgressCallback] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> ProgressCallback:
+    """Build a yt-dlp progress hook forwarding download ticks to the callback.
+
+    Once ``cancel_event`` is set, the next tick aborts the download by
+    raising yt-dlp's ``DownloadCancelled``.
+    """
+    from yt_dlp.utils import DownloadCancelled
+
+    # yt-dlp calls the hook for every network chunk, so "downloading" is
+    # checked first and everything it touches is bound in the closure
+    log_info = logger.info
+    log_error = logger.error
+    is_cancelled = (cancel_event or threading.Event()).is_set
 
-    def __init__(self, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
-        """Initialize with optional progress callback."""
-        self.progress_callback = progress_callback
-        self.console = Console()
+    if progress_callback is None:
 
-    def __call__(self, d: Dict[str, Any]) -> None:
-        """Progress hook callback."""
-        if d["status"] == "downloading":
-            if self.progress_callback:
-                self.progress_callback(d)
-        elif d["status"] == "finished":
-            logger.info(f"Downloaded: {d.get('filename', 'Unknown')}")
-        elif d["status"] == "error":
-            logger.error(f"Download error: {d.get('error', 'Unknown error')}")
+        def quiet_hook(d: Dict[str, Any]) -> None:
+            status = d["status"]
+            if status == "downloading":
+                if is_cancelled():
+                    raise DownloadCancelled()
+                return
+            if status == "finished":
+                log_info(f"Downloaded: {d.get('filename', 'Unknown')}")
+            elif status == "error":
+                log_error(f"Download error: {d.get('error', 'Unknown error')}")
+
+        return quiet_hook
+
+    forward = progress_callback
+
+    def hook(d: Dict[str, Any]) -> None:
+        status = d["status"]
+        if status == "downloading":
+            if is_cancelled():
+                raise DownloadCancelled()
+            forward(d)
+        elif status == "finished":
+            log_info(f"Downloaded: {d.get('filename', 'Unknown')}")
+        elif status == "error":
+            log_error(f"Download error: {d.get('error', 'Unknown error')}")
+
+    return hook
+
+
+def _downloaded_file(ydl: Any, info: Dict[str, Any]) -> Path:
+    """Get the file yt-dlp wrote for a processed info dict."""
+    requested = info.get("requested_downloads") or [{}]
+    return Path(requested[0].get("filepath") or ydl.prepare_filename(info))
 
 
 class VideoDownloader:
     """Main video downloader class."""
 
-    def __init__(self, settings: Optional[Settings] = None) -> None:
-        """Initialize downloader with settings."""
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        cache: Optional[MetadataCache] = None,
+    ) -> None:
+        """Initialize downloader with settings and an optional metadata cache."""
         self.settings = settings or Settings()
-        self.console = Console()
-        self.progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.cache = cache
+        self.console = get_console()
+        self.progress_callback: Optional[ProgressCallback] = None
+        # Set to abort in-flight downloads, e.g. when a playlist is interrupted
+        self._cancelled = threading.Event()
 
-    def set_progress_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+    def set_progress_callback(self, callback: ProgressCallback) -> None:
         """Set progress callback function."""
         self.progress_callback = callback
 
@@ -101,51 +219,84 @@ class VideoDownloader:
         if not validate_url(url):
             raise ValueError(f"Invalid URL: {url}")
 
+        cached_info = self._get_cached_info(url)
+        if cached_info is not None:
+            return cached_info
+
         ydl_opts = {
             "quiet": True,
             "no_warnings": True,
         }
 
+        import yt_dlp
+
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
                 if info is None:
                     raise DownloadError("Could not extract video information")
-                
+
+                if self.cache is not None:
+                    self.cache.set(url, ydl.sanitize_info(info))
+
                 return VideoInfo(info)
         except Exception as e:
             raise DownloadError(f"Failed to get video info: {str(e)}")
 
+    def _get_cached_info(self, url: str) -> Optional[VideoInfo]:
+        """Get video info from the metadata cache, if enabled and fresh."""
+        if self.cache is None:
+            return None
+        cached_info = self.cache.get(url)
+        return VideoInfo(cached_info) if cached_info is not None else None
+
+    def rights_check_required(self) -> bool:
+        """Whether downloads must ask the user to confirm their rights."""
+        return self.settings.user.confirm_rights and not self.settings.user.skip_rights_check
+
     def validate_rights(self, video_info: VideoInfo) -> bool:
         """Validate user has rights to download the content."""
-        if self.settings.user.skip_rights_check:
-            return True
-
-        if not self.settings.user.confirm_rights:
+        if not self.rights_check_required():
             return True
 
         self.console.print(f"\n[yellow]Content Information:[/yellow]")
         self.console.print(f"Title: {video_info.title}")
         self.console.print(f"Uploader: {video_info.uploader}")
         self.console.print(f"URL: {video_info.url}")
-        
+
         if video_info.is_playlist:
             self.console.print(f"Playlist items: {video_info.playlist_count}")
 
-        self.console.print("\n[yellow]Important:[/yellow] Only download content you own or have explicit permission to download.")
-        self.console.print("This includes:")
-        self.console.print("• Your own videos")
-        self.console.print("• Content with Creative Commons license")
-        self.console.print("• Content with explicit permission from the copyright holder")
+        self.console.print(_RIGHTS_NOTICE)
 
         return confirm_rights("Do you confirm you have the rights to download this content?")
 
-    def download_single(self, url: str, output_path: Optional[Path] = None) -> Path:
-        """Download a single video."""
-        video_info = self.get_video_info(url)
-        
-        if not self.validate_rights(video_info):
-            raise RightsError("User does not confirm having rights to the content")
+    def download_single(
+        self,
+        url: str,
+        output_path: Optional[Path] = None,
+        rights_confirmed: bool = False,
+        video_info: Optional[VideoInfo] = None,
+    ) -> Path:
+        """Download a single video.
+
+        Pass ``rights_confirmed=True`` when the rights check already happened
+        for an enclosing playlist, so entries are not re-extracted and the user
+        is not prompted once per item. Otherwise the info extracted for the
+        rights prompt is reused for the download itself. A freshly fetched
+        ``video_info`` is downloaded as is, without extracting it again.
+        """
+        if not rights_confirmed and not validate_url(url):
+            raise ValueError(f"Invalid URL: {url}")
+
+        # With no prompt to show there is nothing to extract info for
+        check_rights = not rights_confirmed and self.rights_check_required()
+        if check_rights:
+            prompt_info = video_info or self._get_cached_info(url)
+            if prompt_info is not None:
+                if not self.validate_rights(prompt_info):
+                    raise RightsError("User does not confirm having rights to the content")
+                check_rights = False
 
         # Override output path if provided
         if output_path:
@@ -153,35 +304,227 @@ class VideoDownloader:
             self.settings.download.output_template = output_path.name
 
         ydl_opts = self.settings.get_ytdlp_options()
-        ydl_opts["progress_hooks"] = [ProgressHook(self.progress_callback)]
+        ydl_opts["progress_hooks"] = [
+            _make_progress_hook(self.progress_callback, self._cancelled)
+        ]
+
+        import yt_dlp
 
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-                
-            # Return the expected output path
-            output_file = self.settings.download.output_dir / self.settings.download.output_template
-            return output_file
+                if check_rights:
+                    # One extraction serves both the rights prompt and the download
+                    info = ydl.extract_info(url, download=False)
+                    if info is None:
+                        raise DownloadError("Could not extract video information")
+                    if self.cache is not None:
+                        self.cache.set(url, ydl.sanitize_info(info))
+
+                    if not self.validate_rights(VideoInfo(info)):
+                        raise RightsError("User does not confirm having rights to the content")
+                    info = ydl.process_ie_result(info, download=True)
+                elif video_info is not None:
+                    # yt-dlp updates the info in place, so the caller's copy is kept intact
+                    info = ydl.process_ie_result(copy.deepcopy(video_info.raw), download=True)
+                else:
+                    info = ydl.extract_info(url, download=True)
+                    if info is None:
+                        raise DownloadError("Could not extract video information")
+
+                return _downloaded_file(ydl, info)
+        except RightsError:
+            raise
         except Exception as e:
             raise DownloadError(f"Download failed: {str(e)}")
 
+    def fetch_raw(self, url: str) -> Path:
+        """Download a video without running yt-dlp post-processors.
+
+        Returns the downloaded file so ``postprocess`` can convert it
+        separately, e.g. while the next playlist item is downloading. Like
+        ``download_single`` with ``rights_confirmed=True``, this does not
+        check rights.
+        """
+        ydl_opts = self.settings.get_ytdlp_options()
+        ydl_opts["postprocessors"] = []
+        ydl_opts["progress_hooks"] = [
+            _make_progress_hook(self.progress_callback, self._cancelled)
+        ]
+
+        import yt_dlp
+
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=True)
+                if info is None:
+                    raise DownloadError("Could not extract video information")
+
+                return _downloaded_file(ydl, info)
+        except Exception as e:
+            raise DownloadError(f"Download failed: {str(e)}")
+
+    def postprocess(self, raw_file: Path) -> Path:
+        """Run the configured yt-dlp post-processors on a file from ``fetch_raw``.
+
+        The post-processors are built from the same options as
+        ``download_single``, so both paths write the same files.
+        """
+        ydl_opts = self.settings.get_ytdlp_options()
+        postprocessors = ydl_opts.get("postprocessors") or []
+        if not postprocessors:
+            return raw_file
+
+        import yt_dlp
+        from yt_dlp.postprocessor import get_postprocessor
+
+        info: Dict[str, Any] = {"filepath": str(raw_file), "ext": raw_file.suffix[1:]}
+
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                for pp_def in postprocessors:
+                    pp_args = {k: v for k, v in pp_def.items() if k not in ("key", "when")}
+                    pp = get_postprocessor(pp_def["key"])(ydl, **pp_args)
+                    info = ydl.run_pp(pp, info)
+        except Exception as e:
+            raise DownloadError(f"Post-processing failed: {str(e)}")
+
+        target = Path(info["filepath"])
+        logger.info(f"Converted: {target}")
+        return target
+
     def download_playlist(
-        self, 
-        url: str, 
+        self,
+        url: str,
         max_items: Optional[int] = None,
         start_item: int = 1,
-        end_item: Optional[int] = None
+        end_item: Optional[int] = None,
+        max_workers: Optional[int] = None,
     ) -> List[Path]:
-        """Download a playlist with limits."""
+        """Download a playlist with limits, several items at a time."""
+        entry_urls = self.get_playlist_entries(url, start_item, end_item, max_items)
+        downloaded_files = self.download_entries(entry_urls, max_workers)
+
+        if entry_urls and not downloaded_files:
+            raise DownloadError("Playlist download failed: no items could be downloaded")
+        return downloaded_files
+
+    def download_entries(
+        self,
+        entry_urls: List[str],
+        max_workers: Optional[int] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[Path]:
+        """Download playlist entries concurrently on a bounded thread pool.
+
+        Entries are network-bound, so worker threads overlap their transfers.
+        With audio extraction enabled, each item's ffmpeg conversion runs on a
+        separate worker while the next item downloads. The URLs must come from
+        ``get_playlist_entries``, which performs the rights checks. Failed
+        entries are logged, passed to ``on_error`` and skipped.
+        """
+        max_workers = max(1, max_workers or self.settings.download.max_workers)
+        postprocess = self.settings.download.extract_audio
+        # Bounds raw files waiting for conversion to one per download slot
+        pending = threading.BoundedSemaphore(max_workers + 1)
+        downloaded_files: List[Path] = []
+
+        # On Ctrl-C, running downloads are aborted through the progress hooks
+        # and the pools are shut down without waiting for them
+        self._cancelled.clear()
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        pp_pool = ThreadPoolExecutor(max_workers=1)
+
+        def fetch(entry_url: str) -> "Future[Path]":
+            pending.acquire()
+            try:
+                raw_file = self.fetch_raw(entry_url)
+            except BaseException:
+                pending.release()
+                raise
+            converted = pp_pool.submit(self.postprocess, raw_file)
+            converted.add_done_callback(lambda _: pending.release())
+            return converted
+
+        futures: List["Future[Any]"]
+        if postprocess:
+            futures = [pool.submit(fetch, entry_url) for entry_url in entry_urls]
+        else:
+            futures = [
+                pool.submit(self.download_single, entry_url, None, True)
+                for entry_url in entry_urls
+            ]
+
+        try:
+            for entry_url, future in zip(entry_urls, futures, strict=True):
+                try:
+                    result = future.result()
+                    downloaded_files.append(result.result() if postprocess else result)
+                except Exception as e:
+                    logger.error(f"Failed to download {entry_url}: {str(e)}")
+                    if on_error:
+                        on_error(entry_url, e)
+        except BaseException:
+            self._cancelled.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            pp_pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        pool.shutdown()
+        pp_pool.shutdown()
+        return downloaded_files
+
+    def get_playlist_entries(
+        self,
+        url: str,
+        start_item: int = 1,
+        end_item: Optional[int] = None,
+        max_items: Optional[int] = None,
+        video_info: Optional[VideoInfo] = None,
+        rights_confirmed: bool = False,
+    ) -> List[str]:
+        """Resolve the entry URLs of a playlist within the requested limits.
+
+        Performs the same permission and rights checks as ``download_playlist``
+        so the returned URLs can be handed to ``download_single`` with
+        ``rights_confirmed=True``. Callers that already fetched the playlist
+        and asked for rights pass ``video_info`` and ``rights_confirmed`` so
+        neither happens twice.
+        """
+        video_info, start_item, end_item = self._resolve_playlist_range(
+            url, max_items, start_item, end_item, video_info, rights_confirmed
+        )
+
+        entry_urls: List[str] = []
+        for entry in video_info.entries[start_item - 1:end_item]:
+            if not entry:
+                continue
+            entry_url = entry.get("webpage_url") or entry.get("url")
+            if entry_url:
+                entry_urls.append(entry_url)
+
+        logger.info(f"Resolved {len(entry_urls)} playlist entries ({start_item} to {end_item} of {video_info.playlist_count})")
+        return entry_urls
+
+    def _resolve_playlist_range(
+        self,
+        url: str,
+        max_items: Optional[int],
+        start_item: int,
+        end_item: Optional[int],
+        video_info: Optional[VideoInfo] = None,
+        rights_confirmed: bool = False,
+    ) -> Tuple[VideoInfo, int, int]:
+        """Check playlist permissions and clamp the requested item range."""
         if not self.settings.user.allow_playlist_download:
             raise RightsError("Playlist downloads are not allowed in settings")
 
-        video_info = self.get_video_info(url)
-        
+        if video_info is None:
+            video_info = self.get_video_info(url)
+
         if not video_info.is_playlist:
             raise ValueError("URL is not a playlist")
 
-        if not self.validate_rights(video_info):
+        if not rights_confirmed and not self.validate_rights(video_info):
             raise RightsError("User does not confirm having rights to the content")
 
         # Apply limits
@@ -193,49 +536,13 @@ class VideoDownloader:
         start_item = max(1, start_item)
         end_item = min(end_item, video_info.playlist_count)
 
-        logger.info(f"Downloading playlist items {start_item} to {end_item} of {video_info.playlist_count}")
-
-        # Update settings for playlist
-        self.settings.download.playlist_start = start_item
-        self.settings.download.playlist_end = end_item
-
-        ydl_opts = self.settings.get_ytdlp_options()
-        
-        downloaded_files: List[Path] = []
-
-        def playlist_progress_hook(d: Dict[str, Any]) -> None:
-            """Progress hook for playlist downloads."""
-            if d["status"] == "downloading":
-                # Show progress for individual items
-                title = d.get("filename", "Unknown")
-                if "playlist_index" in d:
-                    title = f"[{d['playlist_index']}/{video_info.playlist_count}] {title}"
-                logger.info(f"Downloading: {title}")
-            elif d["status"] == "finished":
-                filename = d.get("filename", "")
-                if filename:
-                    downloaded_files.append(Path(filename))
-                    logger.info(f"Completed: {filename}")
-            elif d["status"] == "error":
-                logger.error(f"Download error: {d.get('error', 'Unknown error')}")
-            
-            if self.progress_callback:
-                self.progress_callback(d)
-
-        ydl_opts["progress_hooks"] = [playlist_progress_hook]
-
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-                
-            return downloaded_files
-        except Exception as e:
-            raise DownloadError(f"Playlist download failed: {str(e)}")
+        return video_info, start_item, end_item
 
     def list_formats(self, url: str) -> List[Dict[str, Any]]:
         """List available formats for a video."""
         video_info = self.get_video_info(url)
-        return video_info.formats
+        formats: List[Dict[str, Any]] = video_info.formats
+        return formats
 
     def extract_audio_only(self, url: str, output_path: Optional[Path] = None) -> Path:
         """Extract audio only from video."""
@@ -250,11 +557,14 @@ class VideoDownloader:
 
     def save_metadata(self, video_info: VideoInfo, output_dir: Path) -> Path:
         """Save video metadata to JSON file."""
-        metadata_file = output_dir / f"{video_info.title}_metadata.json"
-        
-        with open(metadata_file, "w", encoding="utf-8") as f:
-            json.dump(video_info.to_dict(), f, indent=2, ensure_ascii=False)
-        
+        metadata_file = output_dir.joinpath(f"{video_info.safe_title}_metadata.json")
+
+        metadata_file.write_bytes(
+            orjson.dumps(
+                video_info.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        )
+
         return metadata_file
 
     def download_thumbnail(self, video_info: VideoInfo, output_dir: Path) -> Optional[Path]:
@@ -262,19 +572,19 @@ class VideoDownloader:
         if not video_info.thumbnail:
             return None
 
-        import requests
-        
         thumbnail_url = video_info.thumbnail
-        thumbnail_ext = Path(thumbnail_url).suffix or ".jpg"
-        thumbnail_file = output_dir / f"{video_info.title}_thumbnail{thumbnail_ext}"
+        thumbnail_ext = os.path.splitext(urlparse(thumbnail_url).path)[1] or ".jpg"
+        thumbnail_file = output_dir.joinpath(f"{video_info.safe_title}_thumbnail{thumbnail_ext}")
 
         try:
-            response = requests.get(thumbnail_url, timeout=30)
-            response.raise_for_status()
-            
-            with open(thumbnail_file, "wb") as f:
-                f.write(response.content)
-            
+            with _http_session().get(thumbnail_url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                # Let urllib3 undo any Content-Encoding while streaming
+                response.raw.decode_content = True
+
+                with open(thumbnail_file, "wb") as f:
+                    shutil.copyfileobj(response.raw, f, length=THUMBNAIL_CHUNK_SIZE)
+
             return thumbnail_file
         except Exception as e:
             logger.error(f"Failed to download thumbnail: {str(e)}")
@@ -1,7 +1,7 @@
 """Terminal User Interface using Rich."""
 
-import time
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 from rich.console import Console
 from rich.live import Live
@@ -11,15 +11,95 @@ from rich.progress import (
     DownloadColumn,
     Progress,
     SpinnerColumn,
+    TaskID,
     TextColumn,
     TimeElapsedColumn,
     TimeRemainingColumn,
     TransferSpeedColumn,
 )
+from rich.status import Status
 from rich.table import Table
 from rich.text import Text
 
-from ytdl_helper.utils import format_duration, format_file_size
+from ytdl_helper.utils import (
+    build_format_rows,
+    format_duration,
+    format_file_size,
+    get_console,
+)
+
+# Smallest byte advance worth redrawing the bar for; yt-dlp reports far more often
+PROGRESS_MIN_STEP = 256 * 1024
+
+# Static panels are parsed once at import instead of on every call
+_WELCOME_PANEL = Panel(
+    Text.from_markup(
+        "[bold blue]YTDL Helper[/bold blue] - Video Downloader\n"
+        "\n"
+        "A CLI tool for downloading videos with yt-dlp,\n"
+        "respecting copyright and user rights."
+    ),
+    title=Text.from_markup("[bold blue]Welcome[/bold blue]"),
+    border_style="blue",
+    padding=(1, 2),
+)
+
+_HELP_PANEL = Panel(
+    Text.from_markup("""
+[bold]Usage Examples:[/bold]
+
+[cyan]Download single video:[/cyan]
+  ytdl-helper download https://youtube.com/watch?v=VIDEO_ID
+
+[cyan]Download audio only:[/cyan]
+  ytdl-helper download --audio-only https://youtube.com/watch?v=VIDEO_ID
+
+[cyan]Download playlist:[/cyan]
+  ytdl-helper playlist https://youtube.com/playlist?list=PLAYLIST_ID
+
+[cyan]Download playlist with limits:[/cyan]
+  ytdl-helper playlist --max-items 5 --start 1 --end 5 URL
+
+[cyan]Download playlist audio only:[/cyan]
+  ytdl-helper playlist --audio-only --max-items 10 URL
+
+[cyan]List available formats:[/cyan]
+  ytdl-helper info https://youtube.com/watch?v=VIDEO_ID
+
+[bold]Playlist Options:[/bold]
+  --max-items N         Maximum number of items to download
+  --start N             Start downloading from item N
+  --end N               Stop downloading at item N
+  --output-dir PATH     Output directory
+  --format FORMAT       Video format (best, worst, mp4, etc.)
+  --audio-only          Extract audio only
+  --audio-format FORMAT Audio format (mp3, wav, etc.)
+  --metadata            Save metadata and thumbnail
+  --concurrency N       Download N playlist items in parallel
+  --help                Show this help
+""".strip()),
+    title=Text.from_markup("[bold blue]Help[/bold blue]"),
+    border_style="blue",
+    padding=(1, 2),
+)
+
+_RIGHTS_WARNING_PANEL = Panel(
+    Text.from_markup(
+        "[bold red]IMPORTANT: COPYRIGHT NOTICE[/bold red]\n"
+        "\n"
+        "[yellow]Only download content that you own or have explicit permission to download.[/yellow]\n"
+        "\n"
+        "This includes:\n"
+        "• Your own videos\n"
+        "• Content with Creative Commons license\n"
+        "• Content with explicit permission from the copyright holder\n"
+        "\n"
+        "[red]Do not download copyrighted content without permission![/red]"
+    ),
+    title=Text.from_markup("[bold red]Copyright Warning[/bold red]"),
+    border_style="red",
+    padding=(1, 2),
+)
 
 
 class DownloadProgress:
@@ -27,7 +107,7 @@ class DownloadProgress:
 
     def __init__(self, console: Optional[Console] = None) -> None:
         """Initialize progress display."""
-        self.console = console or Console()
+        self.console = console or get_console()
         self.progress = Progress(
             SpinnerColumn(),
             TextColumn("[bold blue]{task.description}"),
@@ -43,11 +123,21 @@ class DownloadProgress:
             TimeRemainingColumn(),
             console=self.console,
         )
-        self.task_id: Optional[str] = None
+        self.task_id: Optional[TaskID] = None
         self.live: Optional[Live] = None
+        # Concurrent playlist downloads report from worker threads, so the
+        # per-file byte counts are merged under a lock.
+        self._lock = threading.Lock()
+        self._items: Dict[str, Tuple[int, int, float]] = {}
+        self._last_downloaded = 0
+        self._last_total = 0
+        self._last_total_str = ""
 
     def start_download(self, filename: str) -> None:
         """Start progress display for download."""
+        self._items.clear()
+        self._last_downloaded = 0
+        self._last_total = 0
         self.task_id = self.progress.add_task(
             f"Downloading {filename}",
             total=100,
@@ -62,24 +152,43 @@ class DownloadProgress:
 
     def update_progress(self, progress_data: Dict[str, Any]) -> None:
         """Update progress from yt-dlp hook."""
-        if not self.task_id or not self.live:
+        if self.task_id is None or not self.live:
             return
 
         # Extract progress information
-        downloaded = progress_data.get("downloaded_bytes", 0)
-        total = progress_data.get("total_bytes", 0)
-        speed = progress_data.get("speed", 0)
-        
-        if total > 0:
-            percentage = (downloaded / total) * 100
-            self.progress.update(
-                self.task_id,
-                completed=percentage,
-                total=100,
-                downloaded=format_file_size(downloaded),
-                total_size=format_file_size(total),
-                speed=format_file_size(speed) + "/s",
-            )
+        filename = progress_data.get("filename", "")
+        downloaded = progress_data.get("downloaded_bytes") or 0
+        total = progress_data.get("total_bytes") or 0
+        speed = progress_data.get("speed") or 0
+
+        with self._lock:
+            self._items[filename] = (downloaded, total, speed)
+            if len(self._items) > 1:
+                downloaded = sum(item[0] for item in self._items.values())
+                total = sum(item[1] for item in self._items.values())
+                speed = sum(item[2] for item in self._items.values())
+
+            if total > 0:
+                if (
+                    total == self._last_total
+                    and downloaded < total
+                    and downloaded - self._last_downloaded < PROGRESS_MIN_STEP
+                ):
+                    return
+                if total != self._last_total:
+                    self._last_total = total
+                    self._last_total_str = format_file_size(total)
+                self._last_downloaded = downloaded
+
+                percentage = (downloaded / total) * 100
+                self.progress.update(
+                    self.task_id,
+                    completed=percentage,
+                    total=100,
+                    downloaded=format_file_size(downloaded),
+                    total_size=self._last_total_str,
+                    speed=format_file_size(speed) + "/s",
+                )
 
     def finish_download(self) -> None:
         """Finish progress display."""
@@ -87,17 +196,21 @@ class DownloadProgress:
             self.live.stop()
             self.live = None
         
-        if self.task_id:
+        if self.task_id is not None:
             self.progress.update(self.task_id, completed=100)
             self.task_id = None
 
-    def show_error(self, error_message: str) -> None:
-        """Show error message."""
+    def stop(self) -> None:
+        """Stop the live display without marking the download complete."""
         if self.live:
             self.live.stop()
             self.live = None
+
+    def show_error(self, error_message: str) -> None:
+        """Show error message."""
+        self.stop()
         
-        self.console.print(f"[red]Download Error: {error_message}[/red]")
+        self.console.print(Text(f"Download Error: {error_message}", style="red"))
 
 
 class VideoInfoDisplay:
@@ -105,37 +218,43 @@ class VideoInfoDisplay:
 
     def __init__(self, console: Optional[Console] = None) -> None:
         """Initialize display."""
-        self.console = console or Console()
+        self.console = console or get_console()
 
     def show_video_info(self, video_info: Any) -> None:
         """Show video information in a panel."""
-        # Create info text
-        info_lines = [
-            f"[bold]Title:[/bold] {video_info.title}",
-            f"[bold]Uploader:[/bold] {video_info.uploader}",
-            f"[bold]Duration:[/bold] {format_duration(video_info.duration)}",
-            f"[bold]Upload Date:[/bold] {video_info.upload_date}",
-            f"[bold]View Count:[/bold] {video_info.view_count:,}",
+        # Build styled text directly; titles may contain "[" that is not markup
+        fields = [
+            ("Title", video_info.title),
+            ("Uploader", video_info.uploader),
+            ("Duration", format_duration(video_info.duration)),
+            ("Upload Date", video_info.upload_date),
+            ("View Count", f"{video_info.view_count:,}"),
         ]
         
         if video_info.is_playlist:
-            info_lines.append(f"[bold]Playlist Items:[/bold] {video_info.playlist_count}")
+            fields.append(("Playlist Items", video_info.playlist_count))
         
-        info_text = "\n".join(info_lines)
+        info_text = Text("\n").join(
+            Text.assemble((f"{label}:", "bold"), f" {value}") for label, value in fields
+        )
         
         # Create panel
         panel = Panel(
             info_text,
-            title="[bold blue]Video Information[/bold blue]",
+            title=Text("Video Information", style="bold blue"),
             border_style="blue",
             padding=(1, 2),
         )
         
         self.console.print(panel)
 
-    def show_formats_table(self, formats: list) -> None:
+    def show_formats_table(self, formats: List[Dict[str, Any]]) -> None:
         """Show available formats in a table."""
-        if not formats:
+        self.show_format_rows(build_format_rows(formats))
+
+    def show_format_rows(self, format_rows: List[Tuple[str, ...]]) -> None:
+        """Show prebuilt rows, e.g. ``VideoInfo.format_rows``, in a formats table."""
+        if not format_rows:
             self.console.print("[yellow]No formats available[/yellow]")
             return
 
@@ -147,74 +266,32 @@ class VideoInfoDisplay:
         table.add_column("Codec", style="blue", width=15)
         table.add_column("Note", style="dim", width=20)
 
-        # Show only first 15 formats to avoid clutter
-        for fmt in formats[:15]:
-            format_id = fmt.get("format_id", "unknown")
-            ext = fmt.get("ext", "unknown")
-            quality = fmt.get("quality", "unknown")
-            filesize = fmt.get("filesize", 0)
-            codec = fmt.get("codec", "unknown")
-            note = fmt.get("format_note", "")
-
-            size_str = format_file_size(filesize) if filesize else "Unknown"
-            
-            # Truncate long notes
-            if len(note) > 20:
-                note = note[:17] + "..."
-
-            table.add_row(
-                format_id,
-                ext,
-                str(quality),
-                size_str,
-                codec,
-                note,
-            )
+        for row in format_rows:
+            table.add_row(*row)
 
         self.console.print(table)
 
     def show_rights_warning(self) -> None:
         """Show copyright warning."""
-        warning_text = """
-[bold red]IMPORTANT: COPYRIGHT NOTICE[/bold red]
-
-[yellow]Only download content that you own or have explicit permission to download.[/yellow]
-
-This includes:
-• Your own videos
-• Content with Creative Commons license
-• Content with explicit permission from the copyright holder
-
-[red]Do not download copyrighted content without permission![/red]
-        """.strip()
-
-        panel = Panel(
-            warning_text,
-            title="[bold red]Copyright Warning[/bold red]",
-            border_style="red",
-            padding=(1, 2),
-        )
-        
-        self.console.print(panel)
+        self.console.print(_RIGHTS_WARNING_PANEL)
 
     def show_download_summary(self, downloaded_files: list) -> None:
         """Show download summary."""
         if not downloaded_files:
             return
 
-        summary_lines = [
-            f"[bold green]Successfully downloaded {len(downloaded_files)} file(s):[/bold green]",
-            ""
-        ]
+        summary_text = Text()
+        summary_text.append(
+            f"Successfully downloaded {len(downloaded_files)} file(s):", style="bold green"
+        )
+        summary_text.append("\n")
         
         for file_path in downloaded_files:
-            summary_lines.append(f"• {file_path}")
-
-        summary_text = "\n".join(summary_lines)
+            summary_text.append(f"\n• {file_path}")
         
         panel = Panel(
             summary_text,
-            title="[bold green]Download Complete[/bold green]",
+            title=Text("Download Complete", style="bold green"),
             border_style="green",
             padding=(1, 2),
         )
@@ -227,82 +304,29 @@ class InteractiveTUI:
 
     def __init__(self, console: Optional[Console] = None) -> None:
         """Initialize TUI."""
-        self.console = console or Console()
+        self.console = console or get_console()
         self.progress = DownloadProgress(self.console)
         self.info_display = VideoInfoDisplay(self.console)
 
     def show_welcome(self) -> None:
         """Show welcome message."""
-        welcome_text = """
-[bold blue]YTDL Helper[/bold blue] - Video Downloader
-
-A CLI tool for downloading videos with yt-dlp,
-respecting copyright and user rights.
-        """.strip()
-
-        panel = Panel(
-            welcome_text,
-            title="[bold blue]Welcome[/bold blue]",
-            border_style="blue",
-            padding=(1, 2),
-        )
-        
-        self.console.print(panel)
+        self.console.print(_WELCOME_PANEL)
 
     def show_help(self) -> None:
         """Show help information."""
-        help_text = """
-[bold]Usage Examples:[/bold]
-
-[cyan]Download single video:[/cyan]
-  ytdl-helper download https://youtube.com/watch?v=VIDEO_ID
-
-[cyan]Download audio only:[/cyan]
-  ytdl-helper download --audio-only https://youtube.com/watch?v=VIDEO_ID
-
-[cyan]Download playlist:[/cyan]
-  ytdl-helper playlist https://youtube.com/playlist?list=PLAYLIST_ID
-
-[cyan]Download playlist with limits:[/cyan]
-  ytdl-helper playlist --max-items 5 --start 1 --end 5 URL
-
-[cyan]Download playlist audio only:[/cyan]
-  ytdl-helper playlist --audio-only --max-items 10 URL
-
-[cyan]List available formats:[/cyan]
-  ytdl-helper info https://youtube.com/watch?v=VIDEO_ID
-
-[bold]Playlist Options:[/bold]
-  --max-items N         Maximum number of items to download
-  --start N             Start downloading from item N
-  --end N               Stop downloading at item N
-  --output-dir PATH     Output directory
-  --format FORMAT       Video format (best, worst, mp4, etc.)
-  --audio-only          Extract audio only
-  --audio-format FORMAT Audio format (mp3, wav, etc.)
-  --metadata            Save metadata and thumbnail
-  --help                Show this help
-        """.strip()
-
-        panel = Panel(
-            help_text,
-            title="[bold blue]Help[/bold blue]",
-            border_style="blue",
-            padding=(1, 2),
-        )
-        
-        self.console.print(panel)
+        self.console.print(_HELP_PANEL)
 
     def show_error(self, error_message: str, details: Optional[str] = None) -> None:
         """Show error message."""
-        error_content = f"[bold red]{error_message}[/bold red]"
+        # Error text often embeds exception messages, so it is never parsed as markup
+        error_content = Text(error_message, style="bold red")
         
         if details:
-            error_content += f"\n\n[dim]{details}[/dim]"
+            error_content.append(f"\n\n{details}", style="dim")
 
         panel = Panel(
             error_content,
-            title="[bold red]Error[/bold red]",
+            title=Text("Error", style="bold red"),
             border_style="red",
             padding=(1, 2),
         )
@@ -312,18 +336,17 @@ respecting copyright and user rights.
     def show_success(self, message: str) -> None:
         """Show success message."""
         panel = Panel(
-            f"[bold green]{message}[/bold green]",
-            title="[bold green]Success[/bold green]",
+            Text(message, style="bold green"),
+            title=Text("Success", style="bold green"),
             border_style="green",
             padding=(1, 2),
         )
         
         self.console.print(panel)
 
-    def show_loading(self, message: str) -> None:
-        """Show loading spinner."""
-        with self.console.status(f"[bold blue]{message}[/bold blue]", spinner="dots"):
-            time.sleep(0.1)  # Just to show the spinner
+    def show_loading(self, message: str) -> Status:
+        """Get a spinner context to wrap around slow work."""
+        return self.console.status(f"[bold blue]{message}[/bold blue]", spinner="dots")
 
     def clear_screen(self) -> None:
         """Clear the screen."""
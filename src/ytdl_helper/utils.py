@@ -1,94 +1,153 @@
 """Utility functions for ytdl-helper."""
 
+import os
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union
-from urllib.parse import urlparse
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunparse
 
 from rich.console import Console
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
 
+_console: Optional[Console] = None
+
+MAX_URL_LENGTH = 2048
+# Only the first formats are shown in the TUI, to avoid clutter
+MAX_FORMAT_ROWS = 15
+_URL_SCHEMES = ("http://", "https://")
+# http(s) URL with a plain, non-empty netloc; IPv6 brackets and whitespace
+# that urllib strips are left to urlsplit
+_PLAIN_NETLOC_RE = re.compile(r"https?://[^/?#\[\]\t\r\n]+(?=[/?#]|$)", re.IGNORECASE)
+# On YouTube only these query parameters identify a video or playlist; the
+# rest is tracking noise. Other sites may identify media by any parameter.
+_YOUTUBE_HOSTS = ("youtube.com", "youtu.be", "youtube-nocookie.com")
+_IDENTITY_QUERY_KEYS = ("v", "list")
+
+# The host must be YouTube itself, not a query value mentioning it
+_PLAYLIST_ID_RE = re.compile(
+    r"^https?://(?:[\w-]+\.)*(?i:youtube\.com|youtu\.be)(?::\d+)?(?=[/?])[^#]*?[?&]list=([^&#]+)"
+)
+_PLAYLIST_INDICATOR_RE = re.compile(r"/playlist|/channel/|/user/|/c/|/@|list=", re.IGNORECASE)
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+# Format fields shown by display_formats_table, besides the size
+_FORMAT_TABLE_KEYS = ("format_id", "ext", "quality", "codec")
+# (header, style) column layouts of the display tables
+_VIDEO_INFO_COLUMNS = (("Property", "cyan"), ("Value", "white"))
+_FORMATS_COLUMNS = (
+    ("Format ID", "cyan"),
+    ("Extension", "green"),
+    ("Quality", "yellow"),
+    ("Size", "magenta"),
+    ("Codec", "blue"),
+)
+# Output template fields filled in by create_output_path
+_TEMPLATE_RE = re.compile(r"%\((title|uploader|upload_date|ext)\)s")
+
+# Invalid filename characters become "_"; control characters other than tab
+# and newlines are dropped, all in one translate pass
+_INVALID_FILENAME_CHARS = '<>:"/\\|?*'
+_SANITIZE_TABLE = str.maketrans(
+    _INVALID_FILENAME_CHARS,
+    "_" * len(_INVALID_FILENAME_CHARS),
+    "".join(chr(code) for code in range(32) if chr(code) not in "\t\n\r"),
+)
+
+
+def get_console() -> Console:
+    """Get the process-wide console, creating it on first use."""
+    global _console
+    if _console is None:
+        _console = Console()
+    return _console
+
 
 def validate_url(url: str) -> bool:
     """Validate if URL is supported by yt-dlp."""
+    # Checked before the cache, which cannot hash arbitrary objects
     if not url or not isinstance(url, str):
         return False
+    # Pasted URLs often carry surrounding whitespace; strip it so the gate
+    # and the cache see one canonical key
+    url = url.strip()
+    if not url:
+        return False
+    return _validate_url(url)
+
+
+# The same URL is checked by several code paths, so results are memoized
+@lru_cache(maxsize=1024)
+def _validate_url(url: str) -> bool:
+    """Validate a non-empty URL string; see ``validate_url``."""
+    # Cheap scheme and length gate before any parsing
+    if len(url) > MAX_URL_LENGTH or not url[:8].lower().startswith(_URL_SCHEMES):
+        return False
     
-    # Basic URL validation
-    try:
-        parsed = urlparse(url)
-        if not parsed.scheme or not parsed.netloc:
+    # Most URLs have a plain host and need no full parse; urlsplit only
+    # raises ValueError, e.g. for a malformed IPv6 netloc
+    if _PLAIN_NETLOC_RE.match(url) is None:
+        try:
+            parsed = urlsplit(url)
+        except ValueError:
+            return False
+        if not parsed.netloc:
             return False
-    except Exception:
-        return False
 
-    # Common video platform patterns
-    supported_patterns = [
-        r"youtube\.com",
-        r"youtu\.be",
-        r"vimeo\.com",
-        r"dailymotion\.com",
-        r"twitch\.tv",
-        r"instagram\.com",
-        r"tiktok\.com",
-        r"twitter\.com",
-        r"x\.com",
-        r"facebook\.com",
-        r"soundcloud\.com",
-        r"bandcamp\.com",
-        r"archive\.org",
-    ]
-
-    # Check if URL matches any supported platform
-    for pattern in supported_patterns:
-        if re.search(pattern, url, re.IGNORECASE):
-            return True
-
-    # For other URLs, assume they might be supported
+    # yt-dlp supports far more sites than any list here, so every
+    # well-formed http(s) URL is accepted
     return True
 
 
+def validate_urls(urls: Iterable[str]) -> List[bool]:
+    """Validate many URLs at once, e.g. expanded playlist entries."""
+    return [validate_url(url) for url in urls]
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a video URL for use as a cache key."""
+    parsed = urlparse(url.strip())
+    netloc = parsed.netloc.lower()
+    host = parsed.hostname or ""
+    if not any(host == name or host.endswith(f".{name}") for name in _YOUTUBE_HOSTS):
+        return urlunparse(parsed._replace(netloc=netloc))
+
+    query = urlencode(
+        [(key, value) for key, value in parse_qsl(parsed.query) if key in _IDENTITY_QUERY_KEYS]
+    )
+    return urlunparse(parsed._replace(netloc=netloc, query=query, fragment=""))
+
+
 def confirm_rights(message: str = "Do you confirm you have the rights to download this content?") -> bool:
     """Ask user to confirm they have rights to the content."""
-    console = Console()
-    return Confirm.ask(message, default=False)
+    return Confirm.ask(message, default=False, console=get_console())
 
 
 def format_duration(seconds: int) -> str:
     """Format duration in seconds to human readable format."""
     if seconds < 60:
         return f"{seconds}s"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        remaining_seconds = seconds % 60
-        return f"{minutes}m {remaining_seconds}s"
-    else:
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        remaining_seconds = seconds % 60
+    hours, remainder = divmod(seconds, 3600)
+    minutes, remaining_seconds = divmod(remainder, 60)
+    if hours:
         return f"{hours}h {minutes}m {remaining_seconds}s"
+    return f"{minutes}m {remaining_seconds}s"
 
 
 def format_file_size(bytes_size: int) -> str:
     """Format file size in bytes to human readable format."""
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if bytes_size < 1024.0:
-            return f"{bytes_size:.1f} {unit}"
-        bytes_size /= 1024.0
-    return f"{bytes_size:.1f} PB"
+    # Each unit is 10 more bits, so the unit index comes straight from the bit length
+    index = 0 if bytes_size < 1024 else min(5, (int(bytes_size).bit_length() - 1) // 10)
+    return f"{bytes_size / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
 
 
+# Titles and uploaders recur across VideoInfo, output paths and file names
+@lru_cache(maxsize=512)
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for filesystem compatibility."""
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    
-    # Remove control characters
-    filename = ''.join(char for char in filename if ord(char) >= 32 or char in '\t\n\r')
+    # Replace invalid characters and remove control characters
+    filename = filename.translate(_SANITIZE_TABLE)
     
     # Limit length
     if len(filename) > 200:
@@ -114,66 +173,106 @@ def create_output_path(
     safe_uploader = sanitize_filename(uploader) if uploader else "Unknown"
     safe_date = upload_date or "Unknown"
     
-    # Replace template variables
-    filename = template
-    filename = filename.replace("%(title)s", safe_title)
-    filename = filename.replace("%(uploader)s", safe_uploader)
-    filename = filename.replace("%(upload_date)s", safe_date)
-    filename = filename.replace("%(ext)s", extension)
+    # Replace template variables in one pass
+    fields = {
+        "title": safe_title,
+        "uploader": safe_uploader,
+        "upload_date": safe_date,
+        "ext": extension,
+    }
+    filename = _TEMPLATE_RE.sub(lambda match: fields[match.group(1)], template)
     
     # Ensure extension is present
-    if not filename.endswith(f".{extension}"):
-        filename += f".{extension}"
+    dot_ext = f".{extension}"
+    if not filename.endswith(dot_ext):
+        filename += dot_ext
     
     return output_dir / filename
 
 
+def _new_table(title: str, columns: Tuple[Tuple[str, str], ...]) -> Table:
+    """Create an empty table with the given (header, style) columns."""
+    # Tables keep their rows in their columns, so each call needs a fresh one
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    return table
+
+
 def display_video_info_table(video_info, console: Optional[Console] = None) -> None:
     """Display video information in a nice table."""
     if console is None:
-        console = Console()
+        console = get_console()
     
-    table = Table(title="Video Information")
-    table.add_column("Property", style="cyan")
-    table.add_column("Value", style="white")
-    
-    table.add_row("Title", video_info.title)
-    table.add_row("Uploader", video_info.uploader)
-    table.add_row("Duration", format_duration(video_info.duration))
-    table.add_row("Upload Date", video_info.upload_date)
-    table.add_row("View Count", f"{video_info.view_count:,}")
-    table.add_row("URL", video_info.url)
+    # Nothing would be rendered, so skip building the table
+    if console.quiet:
+        return
     
     if video_info.is_playlist:
-        table.add_row("Type", f"Playlist ({video_info.playlist_count} items)")
+        video_type = f"Playlist ({video_info.playlist_count} items)"
     else:
-        table.add_row("Type", "Single Video")
+        video_type = "Single Video"
+    
+    rows = (
+        ("Title", video_info.title),
+        ("Uploader", video_info.uploader),
+        ("Duration", format_duration(video_info.duration)),
+        ("Upload Date", video_info.upload_date),
+        ("View Count", f"{video_info.view_count:,}"),
+        ("URL", video_info.url),
+        ("Type", video_type),
+    )
+    
+    table = _new_table("Video Information", _VIDEO_INFO_COLUMNS)
+    
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
     
     console.print(table)
 
 
+def build_format_rows(
+    formats: List[Dict[str, Any]], limit: int = MAX_FORMAT_ROWS
+) -> List[Tuple[str, ...]]:
+    """Build display-ready format table rows, truncating long notes."""
+    rows: List[Tuple[str, ...]] = []
+    for fmt in formats[:limit]:
+        filesize = fmt.get("filesize")
+        note = fmt.get("format_note", "")
+        # Truncate long notes
+        if len(note) > 20:
+            note = note[:17] + "..."
+        rows.append((
+            fmt.get("format_id", "unknown"),
+            fmt.get("ext", "unknown"),
+            str(fmt.get("quality", "unknown")),
+            format_file_size(filesize) if filesize else "Unknown",
+            fmt.get("codec", "unknown"),
+            note,
+        ))
+    return rows
+
+
 def display_formats_table(formats: List[dict], console: Optional[Console] = None) -> None:
     """Display available formats in a table."""
     if console is None:
-        console = Console()
+        console = get_console()
+    
+    # Nothing would be rendered, so skip building the table
+    if console.quiet:
+        return
     
     if not formats:
         console.print("[yellow]No formats available[/yellow]")
         return
     
-    table = Table(title="Available Formats")
-    table.add_column("Format ID", style="cyan")
-    table.add_column("Extension", style="green")
-    table.add_column("Quality", style="yellow")
-    table.add_column("Size", style="magenta")
-    table.add_column("Codec", style="blue")
+    table = _new_table("Available Formats", _FORMATS_COLUMNS)
     
     for fmt in formats[:20]:  # Limit to first 20 formats
-        format_id = fmt.get("format_id", "unknown")
-        ext = fmt.get("ext", "unknown")
-        quality = fmt.get("quality", "unknown")
-        filesize = fmt.get("filesize", 0)
-        codec = fmt.get("codec", "unknown")
+        fmt_get = fmt.get
+        format_id, ext, quality, codec = (fmt_get(key, "unknown") for key in _FORMAT_TABLE_KEYS)
+        filesize = fmt_get("filesize")
         
         size_str = format_file_size(filesize) if filesize else "Unknown"
         
@@ -184,51 +283,47 @@ def display_formats_table(formats: List[dict], console: Optional[Console] = None
 
 def get_user_input(prompt: str, default: Optional[str] = None) -> str:
     """Get user input with optional default."""
-    return Prompt.ask(prompt, default=default or "")
+    return Prompt.ask(prompt, default=default or "", console=get_console())
 
 
 def ensure_directory(path: Union[str, Path]) -> Path:
     """Ensure directory exists, create if it doesn't."""
     path = Path(path)
-    path.mkdir(parents=True, exist_ok=True)
+    # One stat for the common case; mkdir on an existing directory fails
+    # with EEXIST and then stats anyway
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
     return path
 
 
+@lru_cache(maxsize=1024)
 def is_playlist_url(url: str) -> bool:
     """Check if URL is likely a playlist."""
-    playlist_indicators = [
-        "/playlist",
-        "/channel/",
-        "/user/",
-        "/c/",
-        "/@",
-        "list=",
-    ]
-    
-    return any(indicator in url.lower() for indicator in playlist_indicators)
+    return _PLAYLIST_INDICATOR_RE.search(url) is not None
 
 
+@lru_cache(maxsize=1024)
 def extract_playlist_id(url: str) -> Optional[str]:
     """Extract playlist ID from URL."""
-    # YouTube playlist
-    if "youtube.com" in url or "youtu.be" in url:
-        match = re.search(r'[?&]list=([^&]+)', url)
-        if match:
-            return match.group(1)
+    # YouTube playlist; the host check is part of the regex
+    match = _PLAYLIST_ID_RE.search(url)
+    if match:
+        return match.group(1)
     
     # Other platforms might have different patterns
     # This is a simplified implementation
     return None
 
 
-def validate_output_path(path: Path) -> bool:
-    """Validate output path is writable."""
+def validate_output_path(path: Path, strict: bool = False) -> bool:
+    """Validate output path is writable; ``strict`` probes with a test file."""
     try:
-        # Check if parent directory exists and is writable
-        if not path.parent.exists():
-            path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Try to create a test file
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if not strict:
+            return os.access(path.parent, os.W_OK)
+
+        # access(2) can be wrong on network filesystems, so really write
         test_file = path.parent / ".ytdl_test"
         test_file.touch()
         test_file.unlink()
@@ -242,8 +337,10 @@ def get_safe_filename(title: str, extension: str = "") -> str:
     """Get a safe filename from title."""
     safe_title = sanitize_filename(title)
     
-    if extension and not safe_title.endswith(f".{extension}"):
-        safe_title += f".{extension}"
+    if extension:
+        dot_ext = f".{extension}"
+        if not safe_title.endswith(dot_ext):
+            safe_title += dot_ext
     
     return safe_title
 
@@ -258,27 +355,27 @@ def truncate_string(text: str, max_length: int = 50) -> str:
 def print_error(message: str, console: Optional[Console] = None) -> None:
     """Print error message in red."""
     if console is None:
-        console = Console()
+        console = get_console()
     console.print(f"[red]Error: {message}[/red]")
 
 
 def print_success(message: str, console: Optional[Console] = None) -> None:
     """Print success message in green."""
     if console is None:
-        console = Console()
+        console = get_console()
     console.print(f"[green]Success: {message}[/green]")
 
 
 def print_warning(message: str, console: Optional[Console] = None) -> None:
     """Print warning message in yellow."""
     if console is None:
-        console = Console()
+        console = get_console()
     console.print(f"[yellow]Warning: {message}[/yellow]")
 
 
 def print_info(message: str, console: Optional[Console] = None) -> None:
     """Print info message in blue."""
     if console is None:
-        console = Console()
+        console = get_console()
     console.print(f"[blue]Info: {message}[/blue]")
 
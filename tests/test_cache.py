@@ -0,0 +1,81 @@
+"""Tests for cache module."""
+
+from unittest.mock import patch
+
+from ytdl_helper.cache import MetadataCache
+
+
+class TestMetadataCache:
+    """Test MetadataCache class."""
+
+    def test_set_and_get(self, tmp_path) -> None:
+        """Test storing and retrieving info."""
+        cache = MetadataCache(tmp_path / "meta.sqlite")
+        info = {"title": "Test Video", "formats": [{"format_id": "best"}]}
+
+        cache.set("http://example.com/video", info)
+
+        assert cache.get("http://example.com/video") == info
+        cache.close()
+
+    def test_get_missing(self, tmp_path) -> None:
+        """Test lookup of an unknown URL."""
+        cache = MetadataCache(tmp_path / "meta.sqlite")
+        assert cache.get("http://example.com/video") is None
+        cache.close()
+
+    def test_lazy_creation(self, tmp_path) -> None:
+        """Test the database is only created on first use."""
+        cache_path = tmp_path / "nested" / "meta.sqlite"
+        cache = MetadataCache(cache_path)
+        assert not cache_path.exists()
+
+        cache.set("http://example.com/video", {"title": "Test Video"})
+        assert cache_path.exists()
+        cache.close()
+
+    def test_expired_entry(self, tmp_path) -> None:
+        """Test entries older than the TTL are ignored."""
+        cache = MetadataCache(tmp_path / "meta.sqlite", ttl=60)
+
+        with patch("ytdl_helper.cache.time.time", return_value=1000.0):
+            cache.set("http://example.com/video", {"title": "Test Video"})
+        with patch("ytdl_helper.cache.time.time", return_value=1061.0):
+            assert cache.get("http://example.com/video") is None
+        cache.close()
+
+    def test_clear(self, tmp_path) -> None:
+        """Test clearing the cache."""
+        cache = MetadataCache(tmp_path / "meta.sqlite")
+        cache.set("http://example.com/video", {"title": "Test Video"})
+
+        cache.clear()
+
+        assert cache.get("http://example.com/video") is None
+        cache.close()
+
+    def test_unserializable_info(self, tmp_path) -> None:
+        """Test unserializable info is skipped instead of raising."""
+        cache = MetadataCache(tmp_path / "meta.sqlite")
+
+        cache.set("http://example.com/video", {"title": object()})
+
+        assert cache.get("http://example.com/video") is None
+        cache.close()
+
+    def test_corrupt_entry(self, tmp_path) -> None:
+        """Test unreadable entries are treated as a miss."""
+        cache = MetadataCache(tmp_path / "meta.sqlite")
+        cache.set("http://example.com/video", {"title": "Test Video"})
+        with cache._connect() as conn:
+            conn.execute("UPDATE metadata SET data = ?", (b"{not json",))
+
+        assert cache.get("http://example.com/video") is None
+        cache.close()
+
+    def test_key_for(self) -> None:
+        """Test cache keys are stable per URL."""
+        key = MetadataCache.key_for("http://example.com/video")
+        assert key == MetadataCache.key_for("http://example.com/video")
+        assert key != MetadataCache.key_for("http://example.com/other")
+        assert len(key) == 32
@@ -1,6 +1,7 @@
 """Tests for CLI module."""
 
-import tempfile
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -8,7 +9,18 @@ import pytest
 import typer
 from typer.testing import CliRunner
 
+from ytdl_helper import cli
 from ytdl_helper.cli import app
+from ytdl_helper.config import get_base_settings
+
+
+@pytest.fixture
+def mock_downloader_class(request: pytest.FixtureRequest) -> Mock:
+    """Patch VideoDownloader for the duration of a test."""
+    patcher = patch("ytdl_helper.core.VideoDownloader", new_callable=Mock)
+    downloader_class = patcher.start()
+    request.addfinalizer(patcher.stop)
+    return downloader_class
 
 
 class TestCLI:
@@ -18,7 +30,6 @@ class TestCLI:
         """Set up test fixtures."""
         self.runner = CliRunner()
 
-    @patch("ytdl_helper.cli.VideoDownloader")
     def test_download_command_success(self, mock_downloader_class) -> None:
         """Test successful download command."""
         mock_downloader = Mock()
@@ -38,7 +49,7 @@ class TestCLI:
         assert result.exit_code == 0
         mock_downloader.download_single.assert_called_once()
 
-    @patch("ytdl_helper.cli.validate_url")
+    @patch("ytdl_helper.cli.validate_url", new_callable=Mock)
     def test_download_command_invalid_url(self, mock_validate) -> None:
         """Test download command with invalid URL."""
         mock_validate.return_value = False
@@ -51,7 +62,6 @@ class TestCLI:
         assert result.exit_code == 1
         assert "Invalid URL provided" in result.output
 
-    @patch("ytdl_helper.cli.VideoDownloader")
     def test_download_command_no_rights(self, mock_downloader_class) -> None:
         """Test download command without rights."""
         mock_downloader = Mock()
@@ -70,7 +80,6 @@ class TestCLI:
         assert result.exit_code == 1
         assert "Rights confirmation required" in result.output
 
-    @patch("ytdl_helper.cli.VideoDownloader")
     def test_download_command_playlist(self, mock_downloader_class) -> None:
         """Test download command for playlist."""
         mock_downloader = Mock()
@@ -80,7 +89,12 @@ class TestCLI:
             is_playlist=True
         )
         mock_downloader.validate_rights.return_value = True
-        mock_downloader.download_playlist.return_value = [
+        entry_urls = [
+            "https://youtube.com/watch?v=one",
+            "https://youtube.com/watch?v=two",
+        ]
+        mock_downloader.get_playlist_entries.return_value = entry_urls
+        mock_downloader.download_entries.return_value = [
             Path("/tmp/video1.mp4"),
             Path("/tmp/video2.mp4")
         ]
@@ -96,9 +110,102 @@ class TestCLI:
         )
         
         assert result.exit_code == 0
-        mock_downloader.download_playlist.assert_called_once()
+        mock_downloader.get_playlist_entries.assert_called_once()
+        assert mock_downloader.download_entries.call_args.args[0] == entry_urls
+        assert "Downloaded 2 files from playlist" in result.output
+
+    def test_playlist_command_single_fetch(self, mock_downloader_class) -> None:
+        """Test the playlist is fetched and rights are confirmed only once."""
+        mock_downloader = Mock()
+        mock_downloader_class.return_value = mock_downloader
+        playlist_info = Mock(
+            title="Test Playlist",
+            uploader="Test User",
+            duration=0,
+            view_count=0,
+            upload_date="",
+            is_playlist=True,
+            playlist_count=1,
+        )
+        mock_downloader.get_video_info.return_value = playlist_info
+        mock_downloader.validate_rights.return_value = True
+        mock_downloader.get_playlist_entries.return_value = ["https://youtube.com/watch?v=one"]
+        mock_downloader.download_entries.return_value = [Path("/tmp/one.mp4")]
+
+        result = self.runner.invoke(
+            app, ["playlist", "https://youtube.com/playlist?list=test"]
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.get_video_info.assert_called_once()
+        mock_downloader.validate_rights.assert_called_once()
+        call_kwargs = mock_downloader.get_playlist_entries.call_args.kwargs
+        assert call_kwargs["video_info"] is playlist_info
+        assert call_kwargs["rights_confirmed"] is True
+
+    def test_playlist_command_concurrency(self, mock_downloader_class) -> None:
+        """Test playlist command passes --concurrency to the worker pool."""
+        mock_downloader = Mock()
+        mock_downloader_class.return_value = mock_downloader
+        mock_downloader.get_video_info.return_value = Mock(
+            title="Test Playlist",
+            is_playlist=True
+        )
+        entry_urls = [f"https://youtube.com/watch?v={i}" for i in range(5)]
+        mock_downloader.get_playlist_entries.return_value = entry_urls
+        mock_downloader.download_entries.return_value = [
+            Path(f"/tmp/{i}.mp4") for i in range(5)
+        ]
+
+        result = self.runner.invoke(
+            app,
+            [
+                "playlist",
+                "https://youtube.com/playlist?list=test",
+                "--concurrency", "3",
+                "--skip-rights-check",
+                "--quiet",
+            ]
+        )
+
+        assert result.exit_code == 0
+        mock_downloader.download_entries.assert_called_once()
+        assert mock_downloader.download_entries.call_args.args == (entry_urls, 3)
+        assert "Downloaded 5 files from playlist" in result.output
+
+    def test_playlist_command_entry_failure(self, mock_downloader_class) -> None:
+        """Test a failing playlist entry is reported without aborting."""
+        mock_downloader = Mock()
+        mock_downloader_class.return_value = mock_downloader
+        mock_downloader.get_video_info.return_value = Mock(
+            title="Test Playlist",
+            is_playlist=True
+        )
+        mock_downloader.get_playlist_entries.return_value = [
+            "https://youtube.com/watch?v=ok",
+            "https://youtube.com/watch?v=bad",
+        ]
+
+        def fake_download_entries(entry_urls, max_workers, on_error):
+            on_error(entry_urls[1], Exception("Network error"))
+            return [Path("/tmp/ok.mp4")]
+
+        mock_downloader.download_entries.side_effect = fake_download_entries
+
+        result = self.runner.invoke(
+            app,
+            [
+                "playlist",
+                "https://youtube.com/playlist?list=test",
+                "--skip-rights-check",
+                "--quiet",
+            ]
+        )
+
+        assert result.exit_code == 0
+        assert "Failed to download https://youtube.com/watch?v=bad" in result.output
+        assert "Downloaded 1 files from playlist" in result.output
 
-    @patch("ytdl_helper.cli.VideoDownloader")
     def test_download_command_playlist_not_allowed(self, mock_downloader_class) -> None:
         """Test download command for playlist when not allowed."""
         mock_downloader = Mock()
@@ -116,7 +223,6 @@ class TestCLI:
         assert result.exit_code == 1
         assert "Use --playlist flag to download" in result.output
 
-    @patch("ytdl_helper.cli.VideoDownloader")
     def test_info_command_success(self, mock_downloader_class) -> None:
         """Test successful info command."""
         mock_downloader = Mock()
@@ -129,11 +235,10 @@ class TestCLI:
             view_count=1000,
             url="https://youtube.com/watch?v=test",
             is_playlist=False,
-            playlist_count=1
+            playlist_count=1,
+            formats=[{"format_id": "best", "ext": "mp4", "quality": 1080}],
+            format_rows=[("best", "mp4", "1080", "Unknown", "unknown", "")],
         )
-        mock_downloader.list_formats.return_value = [
-            {"format_id": "best", "ext": "mp4", "quality": 1080}
-        ]
         
         result = self.runner.invoke(
             app,
@@ -141,10 +246,11 @@ class TestCLI:
         )
         
         assert result.exit_code == 0
+        # Formats come from the info already fetched, not a second extraction
         mock_downloader.get_video_info.assert_called_once()
-        mock_downloader.list_formats.assert_called_once()
+        mock_downloader.list_formats.assert_not_called()
 
-    @patch("ytdl_helper.cli.validate_url")
+    @patch("ytdl_helper.cli.validate_url", new_callable=Mock)
     def test_info_command_invalid_url(self, mock_validate) -> None:
         """Test info command with invalid URL."""
         mock_validate.return_value = False
@@ -163,19 +269,45 @@ class TestCLI:
         
         assert result.exit_code == 0
         assert "Current Configuration" in result.output
+        assert "\"output_template\"" in result.output
 
-    def test_config_command_reset(self) -> None:
+    def test_config_command_reset(self, tmp_path) -> None:
         """Test config reset command."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_file = Path(tmpdir) / "config.json"
-            result = self.runner.invoke(
-                app,
-                ["config", "--reset", "--config-file", str(config_file)]
-            )
-            
-            assert result.exit_code == 0
-            assert "Configuration reset to defaults" in result.output
-            assert config_file.exists()
+        config_file = tmp_path / "config.json"
+        result = self.runner.invoke(
+            app,
+            ["config", "--reset", "--config-file", str(config_file)]
+        )
+        
+        assert result.exit_code == 0
+        assert "Configuration reset to defaults" in result.output
+        assert config_file.exists()
+
+    def test_config_command_error(self, tmp_path) -> None:
+        """Test config failures are reported as configuration errors."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+        result = self.runner.invoke(
+            app,
+            ["config", "--reset", "--config-file", str(blocker / "config.json")]
+        )
+
+        assert result.exit_code == 1
+        assert "Configuration error" in result.output
+        assert "Unexpected error" not in result.output
+
+    def test_config_command_clear_cache(self, tmp_path, monkeypatch) -> None:
+        """Test config clear-cache command."""
+        monkeypatch.setenv("YTDL_CACHE_DIR", str(tmp_path))
+        get_base_settings.cache_clear()
+        try:
+            result = self.runner.invoke(app, ["config", "--clear-cache"])
+        finally:
+            get_base_settings.cache_clear()
+
+        assert result.exit_code == 0
+        assert "Metadata cache cleared" in result.output
+        assert (tmp_path / "meta.sqlite").exists()
 
     def test_version_command(self) -> None:
         """Test version command."""
@@ -193,9 +325,8 @@ class TestCLI:
         assert "ytdl-helper" in result.output
         assert "A CLI tool for downloading videos" in result.output
 
-    @patch("ytdl_helper.cli.Prompt")
-    @patch("ytdl_helper.cli.VideoDownloader")
-    def test_interactive_command(self, mock_downloader_class, mock_prompt) -> None:
+    @patch("ytdl_helper.cli.Prompt", new_callable=Mock)
+    def test_interactive_command(self, mock_prompt, mock_downloader_class) -> None:
         """Test interactive command."""
         mock_downloader = Mock()
         mock_downloader_class.return_value = mock_downloader
@@ -221,9 +352,81 @@ class TestCLI:
         # Should not crash and should handle the quit command
         assert result.exit_code == 0
 
+    @patch("ytdl_helper.cli.Prompt", new_callable=Mock)
+    def test_interactive_session_cache(self, mock_prompt, mock_downloader_class) -> None:
+        """Test repeated actions on one video reuse the fetched info."""
+        mock_downloader = Mock()
+        mock_downloader_class.return_value = mock_downloader
+        mock_downloader.get_video_info.return_value = Mock(
+            title="Test Video",
+            uploader="Test User",
+            duration=120,
+            upload_date="20231201",
+            view_count=1000,
+            url="https://youtube.com/watch?v=test",
+            is_playlist=False,
+            playlist_count=1,
+            formats=[{"format_id": "best", "ext": "mp4"}],
+            format_rows=[("best", "mp4", "unknown", "Unknown", "unknown", "")],
+        )
+
+        mock_prompt.ask.side_effect = [
+            "https://youtube.com/watch?v=test", "info",
+            "https://youtube.com/watch?v=test&t=42", "formats",
+            "quit",
+        ]
+
+        result = self.runner.invoke(app, ["interactive", "--no-cache"])
+
+        assert result.exit_code == 0
+        mock_downloader.get_video_info.assert_called_once()
+
+    @patch("ytdl_helper.cli.Confirm", new_callable=Mock)
+    @patch("ytdl_helper.cli.Prompt", new_callable=Mock)
+    def test_interactive_reuses_downloader(
+        self, mock_prompt, mock_confirm, mock_downloader_class
+    ) -> None:
+        """Test interactive mode shares one downloader and resets overrides."""
+        mock_downloader = Mock()
+        mock_downloader_class.return_value = mock_downloader
+        mock_downloader.get_video_info.return_value = Mock(
+            title="Test Video",
+            uploader="Test User",
+            duration=120,
+            upload_date="20231201",
+            view_count=1000,
+            url="https://youtube.com/watch?v=test",
+            is_playlist=False,
+            playlist_count=1
+        )
+        mock_downloader.validate_rights.return_value = True
+
+        extract_audio_calls = []
+
+        def download_single(url, rights_confirmed=False):
+            settings = mock_downloader_class.call_args.args[0]
+            extract_audio_calls.append(settings.download.extract_audio)
+            return Path("/tmp/test_video.mp4")
+
+        mock_downloader.download_single.side_effect = download_single
+
+        mock_prompt.ask.side_effect = [
+            "https://youtube.com/watch?v=test", "download",
+            "https://youtube.com/watch?v=test", "download",
+            "quit",
+        ]
+        # Audio only on the first download, defaults on the second
+        mock_confirm.ask.side_effect = [True, False, False, False]
+
+        result = self.runner.invoke(app, ["interactive", "--no-cache"])
+
+        assert result.exit_code == 0
+        mock_downloader_class.assert_called_once()
+        assert extract_audio_calls == [True, False]
+
     def test_download_command_with_options(self) -> None:
         """Test download command with various options."""
-        with patch("ytdl_helper.cli.VideoDownloader") as mock_downloader_class:
+        with patch("ytdl_helper.core.VideoDownloader") as mock_downloader_class:
             mock_downloader = Mock()
             mock_downloader_class.return_value = mock_downloader
             mock_downloader.get_video_info.return_value = Mock(
@@ -250,7 +453,6 @@ class TestCLI:
             assert result.exit_code == 0
             mock_downloader.download_single.assert_called_once()
 
-    @patch("ytdl_helper.cli.VideoDownloader")
     def test_download_command_download_error(self, mock_downloader_class) -> None:
         """Test download command with download error."""
         mock_downloader = Mock()
@@ -270,7 +472,6 @@ class TestCLI:
         assert result.exit_code == 1
         assert "Download failed" in result.output
 
-    @patch("ytdl_helper.cli.VideoDownloader")
     def test_info_command_download_error(self, mock_downloader_class) -> None:
         """Test info command with error."""
         mock_downloader = Mock()
@@ -285,6 +486,78 @@ class TestCLI:
         assert result.exit_code == 1
         assert "Failed to get video information" in result.output
 
+    def test_download_command_error_reported_once(self, mock_downloader_class) -> None:
+        """Test quiet download errors render a single line."""
+        from ytdl_helper.core import DownloadError
+
+        mock_downloader = Mock()
+        mock_downloader_class.return_value = mock_downloader
+        mock_downloader.get_video_info.return_value = Mock(
+            title="Test Video",
+            is_playlist=False
+        )
+        mock_downloader.download_single.side_effect = DownloadError("Network error")
+
+        result = self.runner.invoke(
+            app,
+            [
+                "download",
+                "https://youtube.com/watch?v=test",
+                "--skip-rights-check",
+                "--quiet",
+                "--no-cache",
+            ]
+        )
+
+        assert result.exit_code == 1
+        assert result.output.count("Download failed: Network error") == 1
+
+    @patch("ytdl_helper.cli.validate_url", new_callable=Mock)
+    def test_invalid_url_not_reported_as_unexpected(self, mock_validate) -> None:
+        """Test explicit exits pass through the error scope untouched."""
+        mock_validate.return_value = False
+
+        result = self.runner.invoke(app, ["info", "invalid-url"])
+
+        assert result.exit_code == 1
+        assert "Unexpected error" not in result.output
+
+    @patch("ytdl_helper.cli._get_tui", new_callable=Mock)
+    def test_welcome_shown_once(self, mock_get_tui, monkeypatch) -> None:
+        """Test the welcome banner renders once per process on a terminal."""
+        monkeypatch.setattr(cli, "_welcome_shown", False)
+        monkeypatch.setattr(cli, "console", Mock(is_terminal=True))
+
+        cli._show_welcome_once()
+        cli._show_welcome_once()
+
+        mock_get_tui.return_value.show_welcome.assert_called_once()
+
+    @patch("ytdl_helper.cli._get_tui", new_callable=Mock)
+    def test_welcome_skipped_when_piped(self, mock_get_tui, monkeypatch) -> None:
+        """Test the welcome banner is skipped for non-terminal output."""
+        monkeypatch.setattr(cli, "_welcome_shown", False)
+        monkeypatch.setattr(cli, "console", Mock(is_terminal=False))
+
+        cli._show_welcome_once()
+
+        mock_get_tui.return_value.show_welcome.assert_not_called()
+
+    def test_help_skips_heavy_imports(self) -> None:
+        """Test --help does not load pydantic-settings or yt-dlp."""
+        code = (
+            "import sys\n"
+            "from typer.testing import CliRunner\n"
+            "from ytdl_helper.cli import app\n"
+            "CliRunner().invoke(app, ['--help'])\n"
+            "print(sorted(m for m in ('pydantic_settings', 'yt_dlp') if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
+
     def test_no_args_help(self) -> None:
         """Test that no arguments shows help."""
         result = self.runner.invoke(app, [])
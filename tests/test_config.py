@@ -1,14 +1,19 @@
 """Tests for config module."""
 
 import json
-import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
 
-from ytdl_helper.config import Settings, DownloadSettings, MetadataSettings, UserSettings
+from ytdl_helper.config import (
+    Settings,
+    DownloadSettings,
+    MetadataSettings,
+    UserSettings,
+    get_base_settings,
+)
 
 
 class TestDownloadSettings:
@@ -47,12 +52,24 @@ class TestDownloadSettings:
         assert settings.max_filesize == "100MB"
         assert settings.max_duration == 300
 
-    def test_output_dir_creation(self) -> None:
-        """Test that output directory is created."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            test_dir = Path(tmpdir) / "nonexistent" / "path"
-            settings = DownloadSettings(output_dir=test_dir)
-            assert test_dir.exists()
+    def test_output_dir_creation(self, tmp_path) -> None:
+        """Test that output directory is created when first used."""
+        test_dir = tmp_path / "nonexistent" / "path"
+        settings = Settings(download=DownloadSettings(output_dir=test_dir))
+        assert not test_dir.exists()
+
+        settings.get_ytdlp_options()
+        assert test_dir.exists()
+
+    def test_output_dir_recreated(self, tmp_path) -> None:
+        """Test a deleted output directory is created again on next use."""
+        test_dir = tmp_path / "output"
+        settings = Settings(download=DownloadSettings(output_dir=test_dir))
+        settings.get_ytdlp_options()
+        test_dir.rmdir()
+
+        settings.get_ytdlp_options()
+        assert test_dir.is_dir()
 
     def test_format_validation(self) -> None:
         """Test format validation."""
@@ -144,12 +161,14 @@ class TestSettings:
         assert settings.retries == 5
         assert settings.fragment_retries == 15
 
-    def test_cache_dir_creation(self) -> None:
-        """Test that cache directory is created."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cache_dir = Path(tmpdir) / "cache"
-            settings = Settings(cache_dir=cache_dir)
-            assert cache_dir.exists()
+    def test_cache_dir_creation(self, tmp_path) -> None:
+        """Test that cache directory is created when first used."""
+        cache_dir = tmp_path / "cache"
+        settings = Settings(cache_dir=cache_dir)
+        assert not cache_dir.exists()
+
+        settings.get_ytdlp_options()
+        assert cache_dir.exists()
 
     def test_get_ytdlp_options(self) -> None:
         """Test yt-dlp options generation."""
@@ -181,6 +200,18 @@ class TestSettings:
         
         assert options["writeinfojson"] is True
         assert options["writethumbnail"] is True
+        assert "writedescription" not in options
+
+    def test_get_ytdlp_options_subtitles(self) -> None:
+        """Test yt-dlp options for subtitles."""
+        settings = Settings()
+        settings.metadata.write_subtitles = True
+        settings.metadata.subtitle_langs = ["en", "es"]
+        options = settings.get_ytdlp_options()
+
+        assert options["writesubtitles"] is True
+        assert options["subtitleslangs"] == ["en", "es"]
+        assert options["subtitleslangs"] is not settings.metadata.subtitle_langs
 
     def test_get_ytdlp_options_playlist(self) -> None:
         """Test yt-dlp options for playlist."""
@@ -192,6 +223,42 @@ class TestSettings:
         assert options["playliststart"] == 1
         assert options["playlistend"] == 5
 
+    def test_get_ytdlp_options_cached(self) -> None:
+        """Test options are reused until the settings change."""
+        settings = Settings()
+        with patch.object(
+            Settings, "_build_ytdlp_options", autospec=True,
+            side_effect=Settings._build_ytdlp_options,
+        ) as mock_build:
+            first = settings.get_ytdlp_options()
+            first["progress_hooks"] = []
+            second = settings.get_ytdlp_options()
+
+            assert mock_build.call_count == 1
+            assert "progress_hooks" not in second
+
+            settings.download.format = "worst"
+            assert settings.get_ytdlp_options()["format"] == "worst"
+            assert mock_build.call_count == 2
+
+    def test_get_ytdlp_options_nested_copy(self) -> None:
+        """Test nested option containers are not shared with the cache."""
+        settings = Settings()
+        settings.download.extract_audio = True
+        settings.metadata.write_subtitles = True
+        first = settings.get_ytdlp_options()
+        first["postprocessors"][0]["preferredcodec"] = "wav"
+        first["postprocessors"].append({"key": "FFmpegMetadata"})
+        first["subtitleslangs"].append("xx")
+
+        second = settings.get_ytdlp_options()
+        assert second["postprocessors"] == [{
+            "key": "FFmpegExtractAudio",
+            "preferredcodec": settings.download.audio_format,
+            "preferredquality": "192",
+        }]
+        assert "xx" not in second["subtitleslangs"]
+
     @patch.dict("os.environ", {"YTDL_VERBOSE": "true", "YTDL_RETRIES": "10"})
     def test_from_env(self) -> None:
         """Test loading settings from environment."""
@@ -199,27 +266,31 @@ class TestSettings:
         assert settings.verbose is True
         assert settings.retries == 10
 
-    def test_save_and_load_from_file(self) -> None:
-        """Test saving and loading settings from file."""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            file_path = Path(f.name)
-        
+    def test_get_base_settings_cached(self) -> None:
+        """Test base settings are loaded once and shared."""
+        get_base_settings.cache_clear()
         try:
-            # Create settings
-            settings = Settings()
-            settings.verbose = True
-            settings.retries = 5
-            
-            # Save to file
-            settings.save_to_file(file_path)
-            
-            # Load from file
-            loaded_settings = Settings.load_from_file(file_path)
-            
-            assert loaded_settings.verbose is True
-            assert loaded_settings.retries == 5
+            assert get_base_settings() is get_base_settings()
         finally:
-            file_path.unlink()
+            get_base_settings.cache_clear()
+
+    def test_save_and_load_from_file(self, tmp_path) -> None:
+        """Test saving and loading settings from file."""
+        file_path = tmp_path / "settings.json"
+        
+        # Create settings
+        settings = Settings()
+        settings.verbose = True
+        settings.retries = 5
+        
+        # Save to file
+        settings.save_to_file(file_path)
+        
+        # Load from file
+        loaded_settings = Settings.load_from_file(file_path)
+        
+        assert loaded_settings.verbose is True
+        assert loaded_settings.retries == 5
 
     def test_load_from_nonexistent_file(self) -> None:
         """Test loading from nonexistent file."""
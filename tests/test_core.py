@@ -1,41 +1,48 @@
 """Tests for core module."""
 
-import json
-import tempfile
+import io
+import threading
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Mapping
 from unittest.mock import Mock, patch, MagicMock
 
+import orjson
 import pytest
-import yt_dlp
 
+from ytdl_helper.cache import MetadataCache
 from ytdl_helper.config import Settings
 from ytdl_helper.core import (
     VideoDownloader,
     VideoInfo,
     DownloadError,
     RightsError,
-    ProgressHook,
+    _make_progress_hook,
 )
 
 
+@pytest.fixture(scope="module")
+def full_info() -> Mapping[str, Any]:
+    """Get a read-only yt-dlp info dict with every field VideoInfo reads."""
+    return MappingProxyType({
+        "title": "Test Video",
+        "duration": 120,
+        "uploader": "Test User",
+        "upload_date": "20231201",
+        "view_count": 1000,
+        "description": "Test description",
+        "thumbnail": "http://example.com/thumb.jpg",
+        "webpage_url": "http://example.com/video",
+        "formats": [{"format_id": "best", "ext": "mp4"}],
+    })
+
+
 class TestVideoInfo:
     """Test VideoInfo class."""
 
-    def test_video_info_creation(self) -> None:
+    def test_video_info_creation(self, full_info) -> None:
         """Test VideoInfo creation."""
-        info_data = {
-            "title": "Test Video",
-            "duration": 120,
-            "uploader": "Test User",
-            "upload_date": "20231201",
-            "view_count": 1000,
-            "description": "Test description",
-            "thumbnail": "http://example.com/thumb.jpg",
-            "webpage_url": "http://example.com/video",
-            "formats": [{"format_id": "best", "ext": "mp4"}],
-        }
-        
-        video_info = VideoInfo(info_data)
+        video_info = VideoInfo(full_info)
         
         assert video_info.title == "Test Video"
         assert video_info.duration == 120
@@ -64,20 +71,23 @@ class TestVideoInfo:
         assert video_info.is_playlist is True
         assert video_info.playlist_count == 5
 
-    def test_to_dict(self) -> None:
-        """Test conversion to dictionary."""
-        info_data = {
-            "title": "Test Video",
-            "duration": 120,
-            "uploader": "Test User",
-            "upload_date": "20231201",
-            "view_count": 1000,
-            "description": "Test description",
-            "thumbnail": "http://example.com/thumb.jpg",
-            "webpage_url": "http://example.com/video",
-        }
+    def test_format_rows(self) -> None:
+        """Test format rows are truncated and built once."""
+        formats = [
+            {"format_id": str(i), "ext": "mp4", "filesize": 1024, "format_note": "n" * 25}
+            for i in range(20)
+        ]
+        video_info = VideoInfo({"formats": formats})
         
-        video_info = VideoInfo(info_data)
+        rows = video_info.format_rows
+        
+        assert len(rows) == 15
+        assert rows[0] == ("0", "mp4", "unknown", "1.0 KB", "unknown", "n" * 17 + "...")
+        assert video_info.format_rows is rows
+
+    def test_to_dict(self, full_info) -> None:
+        """Test conversion to dictionary."""
+        video_info = VideoInfo(full_info)
         result = video_info.to_dict()
         
         assert result["title"] == "Test Video"
@@ -95,26 +105,36 @@ class TestVideoInfo:
         video_info = VideoInfo(info_data)
         assert str(video_info) == "Video: Test Video by Test User"
 
+    def test_safe_title(self) -> None:
+        """Test the filesystem-safe title is computed once at construction."""
+        video_info = VideoInfo({"title": 'What? A "Test": 1/2'})
+        assert video_info.safe_title == "What_ A _Test__ 1_2"
+
+    def test_slots(self) -> None:
+        """Test VideoInfo carries no per-instance dict."""
+        video_info = VideoInfo({"title": "Test Video"})
+        assert not hasattr(video_info, "__dict__")
+
 
 class TestProgressHook:
-    """Test ProgressHook class."""
+    """Test yt-dlp progress hooks."""
 
     def test_progress_hook_creation(self) -> None:
-        """Test ProgressHook creation."""
-        hook = ProgressHook()
-        assert hook.progress_callback is None
-        assert hook.console is not None
+        """Test progress hook creation."""
+        hook = _make_progress_hook()
+        assert callable(hook)
 
-    def test_progress_hook_with_callback(self) -> None:
-        """Test ProgressHook with callback."""
-        callback = Mock()
-        hook = ProgressHook(callback)
-        assert hook.progress_callback == callback
+    def test_progress_hook_without_callback(self) -> None:
+        """Test downloading ticks are ignored without a callback."""
+        hook = _make_progress_hook()
+
+        # Should not raise an exception
+        hook({"status": "downloading", "downloaded_bytes": 1024})
 
     def test_progress_hook_downloading(self) -> None:
         """Test progress hook for downloading status."""
         callback = Mock()
-        hook = ProgressHook(callback)
+        hook = _make_progress_hook(callback)
         
         data = {
             "status": "downloading",
@@ -127,7 +147,7 @@ class TestProgressHook:
 
     def test_progress_hook_finished(self) -> None:
         """Test progress hook for finished status."""
-        hook = ProgressHook()
+        hook = _make_progress_hook()
         
         data = {
             "status": "finished",
@@ -137,9 +157,34 @@ class TestProgressHook:
         # Should not raise an exception
         hook(data)
 
+    def test_progress_hook_finished_not_forwarded(self) -> None:
+        """Test only downloading ticks reach the callback."""
+        callback = Mock()
+        hook = _make_progress_hook(callback)
+        
+        hook({"status": "finished", "filename": "test.mp4"})
+        hook({"status": "error", "error": "Test error"})
+        
+        callback.assert_not_called()
+
+    def test_progress_hook_cancelled(self) -> None:
+        """Test downloading ticks abort once the cancel event is set."""
+        from yt_dlp.utils import DownloadCancelled
+
+        cancel_event = threading.Event()
+        callback = Mock()
+        hooks = (_make_progress_hook(None, cancel_event), _make_progress_hook(callback, cancel_event))
+        for hook in hooks:
+            hook({"status": "downloading"})
+            cancel_event.set()
+            with pytest.raises(DownloadCancelled):
+                hook({"status": "downloading"})
+            cancel_event.clear()
+        callback.assert_called_once()
+
     def test_progress_hook_error(self) -> None:
         """Test progress hook for error status."""
-        hook = ProgressHook()
+        hook = _make_progress_hook()
         
         data = {
             "status": "error",
@@ -150,12 +195,51 @@ class TestProgressHook:
         hook(data)
 
 
+@pytest.fixture(scope="session")
+def base_settings() -> Settings:
+    """Build the default settings once per test session."""
+    return Settings()
+
+
+@pytest.fixture
+def settings(base_settings: Settings) -> Settings:
+    """Get a deep copy of the default settings that a test may change."""
+    return base_settings.model_copy(deep=True)
+
+
+@pytest.fixture
+def downloader(settings: Settings) -> VideoDownloader:
+    """Get a downloader using the test's settings."""
+    return VideoDownloader(settings)
+
+
+@pytest.fixture
+def mock_ydl_class(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Patch yt_dlp.YoutubeDL for the duration of a test."""
+    ydl_class = MagicMock()
+    monkeypatch.setattr("yt_dlp.YoutubeDL", ydl_class)
+    return ydl_class
+
+
+@pytest.fixture
+def mock_ydl(mock_ydl_class: MagicMock) -> Mock:
+    """Get the YoutubeDL instance yielded by the patched context manager."""
+    ydl = Mock()
+    mock_ydl_class.return_value.__enter__.return_value = ydl
+    downloaded_info = {
+        "title": "Test Video",
+        "requested_downloads": [{"filepath": "/tmp/Test Video.mp4"}],
+    }
+    ydl.extract_info.return_value = downloaded_info
+    ydl.process_ie_result.return_value = downloaded_info
+    return ydl
+
+
 class TestVideoDownloader:
     """Test VideoDownloader class."""
 
-    def test_downloader_creation(self) -> None:
+    def test_downloader_creation(self, settings) -> None:
         """Test VideoDownloader creation."""
-        settings = Settings()
         downloader = VideoDownloader(settings)
         
         assert downloader.settings == settings
@@ -169,20 +253,15 @@ class TestVideoDownloader:
         assert isinstance(downloader.settings, Settings)
         assert downloader.console is not None
 
-    def test_set_progress_callback(self) -> None:
+    def test_set_progress_callback(self, downloader) -> None:
         """Test setting progress callback."""
-        downloader = VideoDownloader()
         callback = Mock()
         
         downloader.set_progress_callback(callback)
         assert downloader.progress_callback == callback
 
-    @patch("ytdl_helper.core.yt_dlp.YoutubeDL")
-    def test_get_video_info_success(self, mock_ydl_class) -> None:
+    def test_get_video_info_success(self, mock_ydl: Mock, downloader) -> None:
         """Test successful video info extraction."""
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        
         expected_info = {
             "title": "Test Video",
             "duration": 120,
@@ -191,51 +270,56 @@ class TestVideoDownloader:
         }
         mock_ydl.extract_info.return_value = expected_info
         
-        downloader = VideoDownloader()
         video_info = downloader.get_video_info("http://example.com/video")
         
         assert video_info.title == "Test Video"
         assert video_info.duration == 120
         assert video_info.uploader == "Test User"
 
-    @patch("ytdl_helper.core.yt_dlp.YoutubeDL")
-    def test_get_video_info_failure(self, mock_ydl_class) -> None:
+    def test_get_video_info_failure(self, mock_ydl: Mock, downloader) -> None:
         """Test video info extraction failure."""
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
         mock_ydl.extract_info.return_value = None
         
-        downloader = VideoDownloader()
         
         with pytest.raises(DownloadError, match="Could not extract video information"):
             downloader.get_video_info("http://example.com/video")
 
-    @patch("ytdl_helper.core.yt_dlp.YoutubeDL")
-    def test_get_video_info_exception(self, mock_ydl_class) -> None:
+    def test_get_video_info_exception(self, mock_ydl: Mock, downloader) -> None:
         """Test video info extraction with exception."""
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
         mock_ydl.extract_info.side_effect = Exception("Network error")
         
-        downloader = VideoDownloader()
         
         with pytest.raises(DownloadError, match="Failed to get video info"):
             downloader.get_video_info("http://example.com/video")
 
-    @patch("ytdl_helper.core.validate_url")
-    def test_get_video_info_invalid_url(self, mock_validate) -> None:
+    def test_get_video_info_cached(self, tmp_path, mock_ydl: Mock) -> None:
+        """Test video info is served from the metadata cache."""
+        expected_info = {"title": "Test Video", "webpage_url": "http://example.com/video"}
+        mock_ydl.extract_info.return_value = expected_info
+        mock_ydl.sanitize_info.return_value = expected_info
+
+        cache = MetadataCache(tmp_path / "meta.sqlite")
+        downloader = VideoDownloader(cache=cache)
+
+        first = downloader.get_video_info("http://example.com/video")
+        second = downloader.get_video_info("http://example.com/video")
+        cache.close()
+
+        assert first.title == second.title == "Test Video"
+        mock_ydl.extract_info.assert_called_once()
+
+    def test_get_video_info_invalid_url(self, monkeypatch, downloader) -> None:
         """Test video info with invalid URL."""
-        mock_validate.return_value = False
+        monkeypatch.setattr("ytdl_helper.core.validate_url", lambda url: False)
         
-        downloader = VideoDownloader()
         
         with pytest.raises(ValueError, match="Invalid URL"):
             downloader.get_video_info("invalid-url")
 
-    @patch("ytdl_helper.core.confirm_rights")
-    def test_validate_rights_skip_check(self, mock_confirm) -> None:
+    def test_validate_rights_skip_check(self, monkeypatch, settings) -> None:
         """Test rights validation with skip check."""
-        settings = Settings()
+        mock_confirm = Mock()
+        monkeypatch.setattr("ytdl_helper.core.confirm_rights", mock_confirm)
         settings.user.skip_rights_check = True
         
         downloader = VideoDownloader(settings)
@@ -245,10 +329,10 @@ class TestVideoDownloader:
         assert result is True
         mock_confirm.assert_not_called()
 
-    @patch("ytdl_helper.core.confirm_rights")
-    def test_validate_rights_no_confirmation(self, mock_confirm) -> None:
+    def test_validate_rights_no_confirmation(self, monkeypatch, settings) -> None:
         """Test rights validation without confirmation."""
-        settings = Settings()
+        mock_confirm = Mock()
+        monkeypatch.setattr("ytdl_helper.core.confirm_rights", mock_confirm)
         settings.user.confirm_rights = False
         
         downloader = VideoDownloader(settings)
@@ -258,13 +342,12 @@ class TestVideoDownloader:
         assert result is True
         mock_confirm.assert_not_called()
 
-    @patch("ytdl_helper.core.confirm_rights")
-    def test_validate_rights_with_confirmation(self, mock_confirm) -> None:
+    def test_validate_rights_with_confirmation(self, monkeypatch, settings) -> None:
         """Test rights validation with confirmation."""
-        settings = Settings()
+        mock_confirm = Mock(return_value=True)
+        monkeypatch.setattr("ytdl_helper.core.confirm_rights", mock_confirm)
         settings.user.confirm_rights = True
         
-        mock_confirm.return_value = True
         
         downloader = VideoDownloader(settings)
         video_info = VideoInfo({"title": "Test Video"})
@@ -273,77 +356,370 @@ class TestVideoDownloader:
         assert result is True
         mock_confirm.assert_called_once()
 
-    @patch("ytdl_helper.core.yt_dlp.YoutubeDL")
-    @patch("ytdl_helper.core.VideoDownloader.validate_rights")
-    def test_download_single_success(self, mock_validate, mock_ydl_class) -> None:
+    def test_download_single_success(self, tmp_path, monkeypatch, mock_ydl: Mock, settings) -> None:
         """Test successful single video download."""
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_validate.return_value = True
-        
-        settings = Settings()
-        with tempfile.TemporaryDirectory() as tmpdir:
-            settings.download.output_dir = Path(tmpdir)
-            downloader = VideoDownloader(settings)
-            
-            result = downloader.download_single("http://example.com/video")
-            
-            assert isinstance(result, Path)
-            mock_ydl.download.assert_called_once_with(["http://example.com/video"])
-
-    @patch("ytdl_helper.core.VideoDownloader.validate_rights")
-    def test_download_single_no_rights(self, mock_validate) -> None:
-        """Test single video download without rights."""
-        mock_validate.return_value = False
+        mock_validate = Mock(return_value=True)
+        monkeypatch.setattr("ytdl_helper.core.VideoDownloader.validate_rights", mock_validate)
         
-        downloader = VideoDownloader()
+        settings.download.output_dir = tmp_path
+        downloader = VideoDownloader(settings)
+        
+        result = downloader.download_single("http://example.com/video")
         
+        assert result == Path("/tmp/Test Video.mp4")
+        # The info extracted for the rights check is reused for the download
+        mock_ydl.extract_info.assert_called_once_with(
+            "http://example.com/video", download=False
+        )
+        mock_ydl.process_ie_result.assert_called_once_with(
+            mock_ydl.extract_info.return_value, download=True
+        )
+        mock_ydl.download.assert_not_called()
+
+    def test_download_single_no_rights(self, monkeypatch, mock_ydl: Mock, downloader) -> None:
+        """Test a denied rights check stops before anything is downloaded."""
+        mock_validate = Mock(return_value=False)
+        monkeypatch.setattr("ytdl_helper.core.VideoDownloader.validate_rights", mock_validate)
+        mock_ydl.extract_info.return_value = {"title": "Test Video"}
+
         with pytest.raises(RightsError, match="User does not confirm having rights"):
             downloader.download_single("http://example.com/video")
+        mock_ydl.process_ie_result.assert_not_called()
+
+    def test_download_single_rights_not_required(
+        self, tmp_path, monkeypatch, mock_ydl: Mock, settings
+    ) -> None:
+        """Test downloads proceed without a prompt when rights are not required."""
+        settings.user.confirm_rights = False
+        settings.download.output_dir = tmp_path
+        downloader = VideoDownloader(settings)
+        mock_validate = Mock(return_value=False)
+        monkeypatch.setattr("ytdl_helper.core.VideoDownloader.validate_rights", mock_validate)
+
+        result = downloader.download_single("http://example.com/video")
+
+        assert downloader.rights_check_required() is False
+        mock_validate.assert_not_called()
+        mock_ydl.extract_info.assert_called_once_with("http://example.com/video", download=True)
+        assert result == Path("/tmp/Test Video.mp4")
+
+    def test_download_single_skip_rights_no_extraction(
+        self, tmp_path, mock_ydl: Mock, settings
+    ) -> None:
+        """Test skipping the rights check also skips info extraction."""
+        settings.user.skip_rights_check = True
+        settings.download.output_dir = tmp_path
+        downloader = VideoDownloader(settings)
+
+        with patch.object(downloader, "get_video_info") as mock_get_info:
+            downloader.download_single("http://example.com/video")
+
+        mock_get_info.assert_not_called()
+        mock_ydl.extract_info.assert_called_once_with(
+            "http://example.com/video", download=True
+        )
+
+    def test_download_single_prefetched_info(self, mock_ydl: Mock, settings) -> None:
+        """Test info fetched by the caller is downloaded without a second extraction."""
+        settings.user.skip_rights_check = True
+        downloader = VideoDownloader(settings)
+        video_info = VideoInfo({"title": "Test Video", "formats": [{"format_id": "best"}]})
 
-    @patch("ytdl_helper.core.yt_dlp.YoutubeDL")
-    def test_download_single_exception(self, mock_ydl_class) -> None:
+        result = downloader.download_single("http://example.com/video", video_info=video_info)
+
+        assert result == Path("/tmp/Test Video.mp4")
+        mock_ydl.extract_info.assert_not_called()
+        processed_info = mock_ydl.process_ie_result.call_args.args[0]
+        assert processed_info == video_info.raw
+        assert processed_info is not video_info.raw
+
+    def test_download_single_filename_fallback(self, mock_ydl: Mock, downloader) -> None:
+        """Test the prepared filename is used when yt-dlp reports no filepath."""
+        mock_ydl.extract_info.return_value = {"title": "Test Video"}
+        mock_ydl.prepare_filename.return_value = "/tmp/Test Video.webm"
+
+        result = downloader.download_single("http://example.com/video", rights_confirmed=True)
+
+        assert result == Path("/tmp/Test Video.webm")
+
+    def test_download_single_skip_rights_invalid_url(
+        self, monkeypatch, mock_ydl: Mock, settings
+    ) -> None:
+        """Test invalid URLs are rejected even without a rights check."""
+        monkeypatch.setattr("ytdl_helper.core.validate_url", lambda url: False)
+        settings.user.skip_rights_check = True
+        downloader = VideoDownloader(settings)
+
+        with pytest.raises(ValueError, match="Invalid URL"):
+            downloader.download_single("invalid-url")
+        mock_ydl.extract_info.assert_not_called()
+
+    def test_download_single_exception(self, mock_ydl: Mock, settings) -> None:
         """Test single video download with exception."""
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.download.side_effect = Exception("Download failed")
+        mock_ydl.extract_info.side_effect = Exception("Download failed")
         
-        settings = Settings()
         settings.user.skip_rights_check = True
         downloader = VideoDownloader(settings)
         
         with pytest.raises(DownloadError, match="Download failed"):
             downloader.download_single("http://example.com/video")
 
-    @patch("ytdl_helper.core.yt_dlp.YoutubeDL")
-    @patch("ytdl_helper.core.VideoDownloader.validate_rights")
-    def test_download_playlist_success(self, mock_validate, mock_ydl_class) -> None:
+    def test_download_playlist_success(
+        self, tmp_path, monkeypatch, mock_ydl: Mock, settings
+    ) -> None:
         """Test successful playlist download."""
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_validate.return_value = True
+        mock_validate = Mock(return_value=True)
+        monkeypatch.setattr("ytdl_helper.core.VideoDownloader.validate_rights", mock_validate)
         
-        settings = Settings()
         settings.user.allow_playlist_download = True
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            settings.download.output_dir = Path(tmpdir)
-            downloader = VideoDownloader(settings)
+        settings.download.output_dir = tmp_path
+        downloader = VideoDownloader(settings)
+        
+        mock_ydl.extract_info.side_effect = lambda url, download: {
+            "requested_downloads": [{"filepath": f"/tmp/{url[-6:]}.mp4"}],
+        }
+
+        # Mock playlist info
+        with patch.object(downloader, "get_video_info") as mock_get_info:
+            mock_get_info.return_value = VideoInfo({
+                "title": "Test Playlist",
+                "_type": "playlist",
+                "playlist_count": 2,
+                "entries": [
+                    {"url": "http://example.com/video1"},
+                    {"url": "http://example.com/video2"},
+                ],
+            })
+            
+            result = downloader.download_playlist("http://example.com/playlist")
             
-            # Mock playlist info
-            with patch.object(downloader, "get_video_info") as mock_get_info:
-                mock_info = Mock()
-                mock_info.is_playlist = True
-                mock_get_info.return_value = mock_info
-                
-                result = downloader.download_playlist("http://example.com/playlist")
-                
-                assert isinstance(result, list)
-                mock_ydl.download.assert_called_once_with(["http://example.com/playlist"])
-
-    def test_download_playlist_not_allowed(self) -> None:
+            assert result == [Path("/tmp/video1.mp4"), Path("/tmp/video2.mp4")]
+
+    def test_download_playlist_all_failed(self, downloader) -> None:
+        """Test a playlist where every entry fails raises DownloadError."""
+        with patch.object(
+            downloader, "get_playlist_entries", return_value=["http://example.com/video1"]
+        ), patch.object(
+            downloader, "download_single", side_effect=DownloadError("Network error")
+        ):
+            with pytest.raises(DownloadError, match="Playlist download failed"):
+                downloader.download_playlist("http://example.com/playlist")
+
+    def test_download_entries(self, settings) -> None:
+        """Test entries are downloaded on a worker pool in entry order."""
+        downloader = VideoDownloader(settings)
+        entry_urls = [f"http://example.com/video{i}" for i in range(5)]
+
+        with patch.object(
+            downloader, "download_single",
+            side_effect=lambda url, output_path, rights_confirmed: Path(f"/tmp/{url[-1]}.mp4"),
+        ) as mock_download:
+            result = downloader.download_entries(entry_urls, max_workers=3)
+
+        assert result == [Path(f"/tmp/{i}.mp4") for i in range(5)]
+        assert mock_download.call_count == 5
+        for call in mock_download.call_args_list:
+            assert call.args[2] is True
+
+    def test_download_entries_failure(self, downloader) -> None:
+        """Test a failing entry is reported and skipped."""
+        on_error = Mock()
+
+        def fake_download(url, output_path, rights_confirmed):
+            if url.endswith("bad"):
+                raise DownloadError("Network error")
+            return Path("/tmp/ok.mp4")
+
+        with patch.object(downloader, "download_single", side_effect=fake_download):
+            result = downloader.download_entries(
+                ["http://example.com/ok", "http://example.com/bad"], on_error=on_error
+            )
+
+        assert result == [Path("/tmp/ok.mp4")]
+        on_error.assert_called_once()
+        assert on_error.call_args.args[0] == "http://example.com/bad"
+
+    def test_download_entries_interrupt(self, mock_ydl_class: MagicMock, downloader) -> None:
+        """Test an interrupt aborts entries that are already downloading."""
+        started = threading.Event()
+        stopped = threading.Event()
+
+        def make_ydl(ydl_opts):
+            hook = ydl_opts["progress_hooks"][0]
+
+            def extract_info(url, download):
+                if url.endswith("stop"):
+                    started.wait(timeout=5)
+                    raise KeyboardInterrupt
+                started.set()
+                try:
+                    # A long download: one tick every few milliseconds
+                    for _ in range(1000):
+                        hook({"status": "downloading"})
+                        threading.Event().wait(0.005)
+                except BaseException:
+                    stopped.set()
+                    raise
+                return {"requested_downloads": [{"filepath": "/tmp/slow.mp4"}]}
+
+            ydl_context = MagicMock()
+            ydl_context.__enter__.return_value.extract_info.side_effect = extract_info
+            return ydl_context
+
+        mock_ydl_class.side_effect = make_ydl
+
+        with pytest.raises(KeyboardInterrupt):
+            downloader.download_entries(
+                ["http://example.com/stop", "http://example.com/slow"],
+                max_workers=2,
+            )
+
+        # The in-flight download stops at its next tick instead of running on
+        assert stopped.wait(timeout=1)
+
+    def test_download_entries_audio_pipeline(self, settings) -> None:
+        """Test audio entries are fetched raw and converted separately."""
+        settings.download.extract_audio = True
+        downloader = VideoDownloader(settings)
+
+        with patch.object(
+            downloader, "fetch_raw", side_effect=lambda url: Path(f"/tmp/{url[-1]}.webm")
+        ) as mock_fetch, patch.object(
+            downloader, "postprocess", side_effect=lambda raw: raw.with_suffix(".mp3")
+        ) as mock_postprocess, patch.object(downloader, "download_single") as mock_single:
+            result = downloader.download_entries(
+                ["http://example.com/video1", "http://example.com/video2"], max_workers=1
+            )
+
+        assert result == [Path("/tmp/1.mp3"), Path("/tmp/2.mp3")]
+        assert mock_fetch.call_count == 2
+        assert mock_postprocess.call_count == 2
+        mock_single.assert_not_called()
+
+    def test_get_playlist_entries(self, settings) -> None:
+        """Test resolving playlist entry URLs within limits."""
+        settings.user.allow_playlist_download = True
+        settings.user.skip_rights_check = True
+        downloader = VideoDownloader(settings)
+
+        playlist_info = VideoInfo({
+            "title": "Test Playlist",
+            "_type": "playlist",
+            "playlist_count": 4,
+            "entries": [
+                {"webpage_url": "http://example.com/1"},
+                {"url": "http://example.com/2"},
+                None,
+                {"webpage_url": "http://example.com/4"},
+            ],
+        })
+
+        with patch.object(downloader, "get_video_info", return_value=playlist_info):
+            assert downloader.get_playlist_entries("http://example.com/playlist") == [
+                "http://example.com/1",
+                "http://example.com/2",
+                "http://example.com/4",
+            ]
+            assert downloader.get_playlist_entries(
+                "http://example.com/playlist", start_item=2, max_items=1
+            ) == ["http://example.com/2"]
+
+    def test_get_playlist_entries_prefetched(self, settings) -> None:
+        """Test already fetched and confirmed playlists are not fetched or prompted again."""
+        settings.user.allow_playlist_download = True
+        downloader = VideoDownloader(settings)
+        playlist_info = VideoInfo({
+            "_type": "playlist",
+            "playlist_count": 1,
+            "entries": [{"url": "http://example.com/1"}],
+        })
+
+        with patch.object(downloader, "get_video_info") as mock_get_info, \
+                patch.object(downloader, "validate_rights") as mock_validate:
+            entry_urls = downloader.get_playlist_entries(
+                "http://example.com/playlist",
+                video_info=playlist_info,
+                rights_confirmed=True,
+            )
+
+        assert entry_urls == ["http://example.com/1"]
+        mock_get_info.assert_not_called()
+        mock_validate.assert_not_called()
+
+    def test_download_single_rights_confirmed(self, mock_ydl: Mock, downloader) -> None:
+        """Test pre-confirmed downloads skip info extraction and prompting."""
+
+        with patch.object(downloader, "get_video_info") as mock_get_info, \
+                patch.object(downloader, "validate_rights") as mock_validate:
+            downloader.download_single("http://example.com/video", rights_confirmed=True)
+
+            mock_get_info.assert_not_called()
+            mock_validate.assert_not_called()
+            mock_ydl.extract_info.assert_called_once_with(
+                "http://example.com/video", download=True
+            )
+
+    def test_fetch_raw(self, mock_ydl_class: MagicMock, mock_ydl: Mock, settings) -> None:
+        """Test raw fetch skips post-processors and returns the file."""
+        mock_ydl.extract_info.return_value = {
+            "title": "Test Video",
+            "requested_downloads": [{"filepath": "/tmp/Test Video.webm"}],
+        }
+
+        settings.download.extract_audio = True
+        downloader = VideoDownloader(settings)
+
+        result = downloader.fetch_raw("http://example.com/video")
+
+        assert result == Path("/tmp/Test Video.webm")
+        ydl_opts = mock_ydl_class.call_args.args[0]
+        assert ydl_opts["postprocessors"] == []
+        mock_ydl.extract_info.assert_called_once_with("http://example.com/video", download=True)
+
+    def test_postprocess(self, tmp_path, mock_ydl: Mock, settings) -> None:
+        """Test post-processing runs yt-dlp's audio extractor with the settings."""
+        raw_file = tmp_path / "Test Video.webm"
+        mock_ydl.params = {}
+        mock_ydl._postprocessor_hooks = []
+        mock_ydl.run_pp.side_effect = lambda pp, info: {
+            **info, "filepath": str(tmp_path / "Test Video.ogg")
+        }
+
+        settings.download.extract_audio = True
+        settings.download.audio_format = "vorbis"
+        downloader = VideoDownloader(settings)
+
+        result = downloader.postprocess(raw_file)
+
+        assert result == tmp_path / "Test Video.ogg"
+        pp, info = mock_ydl.run_pp.call_args.args
+        assert type(pp).__name__ == "FFmpegExtractAudioPP"
+        assert pp.mapping == "vorbis"
+        assert info["filepath"] == str(raw_file)
+        assert info["ext"] == "webm"
+
+    def test_postprocess_no_postprocessors(self, mock_ydl: Mock, downloader) -> None:
+        """Test files are returned unchanged when audio extraction is off."""
+        raw_file = Path("/tmp/Test Video.webm")
+
+        assert downloader.postprocess(raw_file) == raw_file
+        mock_ydl.run_pp.assert_not_called()
+
+    def test_postprocess_failure(self, mock_ydl: Mock, settings) -> None:
+        """Test post-processor failures raise DownloadError."""
+        mock_ydl.params = {}
+        mock_ydl._postprocessor_hooks = []
+        mock_ydl.run_pp.side_effect = Exception("ffmpeg not found")
+
+        settings.download.extract_audio = True
+        downloader = VideoDownloader(settings)
+
+        with pytest.raises(DownloadError, match="Post-processing failed"):
+            downloader.postprocess(Path("/tmp/Test Video.webm"))
+
+    def test_download_playlist_not_allowed(self, settings) -> None:
         """Test playlist download when not allowed."""
-        settings = Settings()
         settings.user.allow_playlist_download = False
         
         downloader = VideoDownloader(settings)
@@ -351,29 +727,21 @@ class TestVideoDownloader:
         with pytest.raises(RightsError, match="Playlist downloads are not allowed"):
             downloader.download_playlist("http://example.com/playlist")
 
-    @patch("ytdl_helper.core.yt_dlp.YoutubeDL")
-    def test_download_playlist_not_playlist(self, mock_ydl_class) -> None:
+    def test_download_playlist_not_playlist(self, mock_ydl: Mock, settings) -> None:
         """Test playlist download with non-playlist URL."""
-        mock_ydl = Mock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        
-        settings = Settings()
         settings.user.allow_playlist_download = True
         
         downloader = VideoDownloader(settings)
         
         # Mock non-playlist info
         with patch.object(downloader, "get_video_info") as mock_get_info:
-            mock_info = Mock()
-            mock_info.is_playlist = False
-            mock_get_info.return_value = mock_info
+            mock_get_info.return_value = SimpleNamespace(is_playlist=False)
             
             with pytest.raises(ValueError, match="URL is not a playlist"):
                 downloader.download_playlist("http://example.com/video")
 
-    def test_extract_audio_only(self) -> None:
+    def test_extract_audio_only(self, settings) -> None:
         """Test audio extraction."""
-        settings = Settings()
         downloader = VideoDownloader(settings)
         
         with patch.object(downloader, "download_single") as mock_download:
@@ -384,64 +752,90 @@ class TestVideoDownloader:
             assert result == Path("/tmp/test.mp3")
             mock_download.assert_called_once()
 
-    def test_save_metadata(self) -> None:
+    def test_save_metadata(self, tmp_path, downloader) -> None:
         """Test saving metadata."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_dir = Path(tmpdir)
-            video_info = VideoInfo({"title": "Test Video"})
-            
-            downloader = VideoDownloader()
-            result = downloader.save_metadata(video_info, output_dir)
-            
-            assert result.exists()
-            assert result.name == "Test Video_metadata.json"
-            
-            # Check content
-            with open(result, "r") as f:
-                data = json.load(f)
-                assert data["title"] == "Test Video"
+        output_dir = tmp_path
+        video_info = VideoInfo({"title": "Test Video"})
+        
+        result = downloader.save_metadata(video_info, output_dir)
+        
+        assert result.exists()
+        assert result.name == "Test Video_metadata.json"
+        
+        # Check content
+        data = orjson.loads(result.read_bytes())
+        assert data["title"] == "Test Video"
+
+    def test_save_metadata_unicode(self, tmp_path, downloader) -> None:
+        """Test metadata is written as UTF-8 without escaping."""
+        video_info = VideoInfo({"title": "Canción"})
+
+        result = downloader.save_metadata(video_info, tmp_path)
 
-    @patch("requests.get")
-    def test_download_thumbnail_success(self, mock_get) -> None:
+        assert "Canción" in result.read_text(encoding="utf-8")
+
+    def test_download_thumbnail_success(self, tmp_path, monkeypatch, downloader) -> None:
         """Test successful thumbnail download."""
-        mock_response = Mock()
-        mock_response.content = b"thumbnail_data"
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_dir = Path(tmpdir)
-            video_info = VideoInfo({
-                "title": "Test Video",
-                "thumbnail": "http://example.com/thumb.jpg"
-            })
-            
-            downloader = VideoDownloader()
-            result = downloader.download_thumbnail(video_info, output_dir)
-            
-            assert result is not None
-            assert result.exists()
-            assert result.name == "Test Video_thumbnail.jpg"
+        mock_session = MagicMock()
+        monkeypatch.setattr("ytdl_helper.core._http_session", mock_session)
+        mock_response = SimpleNamespace(
+            raw=io.BytesIO(b"thumbnail_data"), raise_for_status=lambda: None
+        )
+        mock_session.return_value.get.return_value.__enter__.return_value = mock_response
+        
+        output_dir = tmp_path
+        video_info = VideoInfo({
+            "title": "Test Video",
+            "thumbnail": "http://example.com/thumb.jpg"
+        })
+        
+        result = downloader.download_thumbnail(video_info, output_dir)
+        
+        assert result is not None
+        assert result.exists()
+        assert result.name == "Test Video_thumbnail.jpg"
+        assert result.read_bytes() == b"thumbnail_data"
+        mock_session.return_value.get.assert_called_once_with(
+            "http://example.com/thumb.jpg", timeout=30, stream=True
+        )
+
+    def test_download_thumbnail_query_string(self, tmp_path, monkeypatch, downloader) -> None:
+        """Test thumbnail names ignore the URL query and unsafe title characters."""
+        mock_session = MagicMock()
+        monkeypatch.setattr("ytdl_helper.core._http_session", mock_session)
+        mock_response = SimpleNamespace(
+            raw=io.BytesIO(b"thumbnail_data"), raise_for_status=lambda: None
+        )
+        mock_session.return_value.get.return_value.__enter__.return_value = mock_response
+
+        video_info = VideoInfo({
+            "title": "Part 1: A/B",
+            "thumbnail": "http://example.com/thumb.webp?v=123"
+        })
 
-    def test_download_thumbnail_no_thumbnail(self) -> None:
+        result = downloader.download_thumbnail(video_info, tmp_path)
+
+        assert result is not None
+        assert result.name == "Part 1_ A_B_thumbnail.webp"
+
+    def test_download_thumbnail_no_thumbnail(self, tmp_path, downloader) -> None:
         """Test thumbnail download with no thumbnail URL."""
         video_info = VideoInfo({"title": "Test Video"})
-        downloader = VideoDownloader()
         
-        result = downloader.download_thumbnail(video_info, Path("/tmp"))
+        result = downloader.download_thumbnail(video_info, tmp_path)
         assert result is None
 
-    @patch("requests.get")
-    def test_download_thumbnail_failure(self, mock_get) -> None:
+    def test_download_thumbnail_failure(self, tmp_path, monkeypatch, downloader) -> None:
         """Test thumbnail download failure."""
-        mock_get.side_effect = Exception("Network error")
+        mock_session = MagicMock()
+        monkeypatch.setattr("ytdl_helper.core._http_session", mock_session)
+        mock_session.return_value.get.side_effect = Exception("Network error")
         
         video_info = VideoInfo({
             "title": "Test Video",
             "thumbnail": "http://example.com/thumb.jpg"
         })
         
-        downloader = VideoDownloader()
-        result = downloader.download_thumbnail(video_info, Path("/tmp"))
+        result = downloader.download_thumbnail(video_info, tmp_path)
         assert result is None
 
@@ -1,21 +1,28 @@
 """Tests for utils module."""
 
-import tempfile
 from pathlib import Path
+from unittest.mock import Mock, patch
 
 import pytest
 
 from ytdl_helper.utils import (
     validate_url,
+    validate_urls,
+    normalize_url,
+    get_console,
     format_duration,
     format_file_size,
     sanitize_filename,
     create_output_path,
+    build_format_rows,
+    display_formats_table,
+    display_video_info_table,
     is_playlist_url,
     extract_playlist_id,
     validate_output_path,
     get_safe_filename,
     truncate_string,
+    _validate_url,
 )
 
 
@@ -72,65 +79,130 @@ class TestValidateUrl:
         assert validate_url("") is False
         assert validate_url(None) is False
 
+    def test_uppercase_scheme(self) -> None:
+        """Test scheme matching is case-insensitive."""
+        assert validate_url("HTTPS://www.youtube.com/watch?v=dQw4w9WgXcQ") is True
+
+    def test_overlong_url(self) -> None:
+        """Test URLs over the length limit are rejected."""
+        assert validate_url("https://youtube.com/watch?v=" + "a" * 2048) is False
+
+    def test_malformed_ipv6_url(self) -> None:
+        """Test URLs urllib cannot split are rejected."""
+        assert validate_url("https://[::1/watch?v=test") is False
+
+    def test_repeated_url_cached(self) -> None:
+        """Test repeated validation of a URL is served from the cache."""
+        _validate_url.cache_clear()
+        validate_url("https://youtube.com/watch?v=cached")
+        validate_url("https://youtube.com/watch?v=cached")
+        assert _validate_url.cache_info().hits == 1
+
+    def test_unhashable_url(self) -> None:
+        """Test non-string input is rejected rather than breaking the cache."""
+        assert validate_url(["https://youtube.com/watch?v=test"]) is False
+        assert validate_url({"url": "https://youtube.com/watch?v=test"}) is False
+
+    def test_surrounding_whitespace(self) -> None:
+        """Test URLs with leading/trailing whitespace are stripped first."""
+        assert validate_url("  https://youtube.com/watch?v=test\n") is True
+        assert validate_url("\thttps://youtu.be/dQw4w9WgXcQ ") is True
+        assert validate_url("   ") is False
+
+        _validate_url.cache_clear()
+        validate_url(" https://youtube.com/watch?v=padded")
+        validate_url("https://youtube.com/watch?v=padded ")
+        assert _validate_url.cache_info().hits == 1
+
+    def test_validate_urls(self) -> None:
+        """Test batch URL validation."""
+        urls = ["https://youtu.be/dQw4w9WgXcQ", "not-a-url", "ftp://example.com/file"]
+        assert validate_urls(urls) == [True, False, False]
+        assert validate_urls(iter(urls[:1])) == [True]
+
+
+class TestNormalizeUrl:
+    """Test URL normalization."""
+
+    def test_strips_tracking_params(self) -> None:
+        """Test non-identifying query params are dropped."""
+        assert normalize_url(
+            "https://WWW.YouTube.com/watch?v=test&t=42&list=PL1#frag"
+        ) == "https://www.youtube.com/watch?v=test&list=PL1"
+
+    def test_same_video_same_key(self) -> None:
+        """Test variants of one video normalize identically."""
+        assert normalize_url("https://youtube.com/watch?v=test") == normalize_url(
+            " https://youtube.com/watch?feature=share&v=test "
+        )
 
-class TestFormatDuration:
-    """Test duration formatting."""
-
-    def test_seconds_only(self) -> None:
-        """Test formatting seconds only."""
-        assert format_duration(30) == "30s"
-        assert format_duration(59) == "59s"
-
-    def test_minutes_and_seconds(self) -> None:
-        """Test formatting minutes and seconds."""
-        assert format_duration(60) == "1m 0s"
-        assert format_duration(90) == "1m 30s"
-        assert format_duration(3599) == "59m 59s"
+    def test_other_hosts_keep_query(self) -> None:
+        """Test query params are kept on sites other than YouTube."""
+        assert normalize_url("https://Example.com/watch?id=1&t=42#frag") == (
+            "https://example.com/watch?id=1&t=42#frag"
+        )
+        assert normalize_url("https://example.com/play?video=1") != normalize_url(
+            "https://example.com/play?video=2"
+        )
 
-    def test_hours_minutes_seconds(self) -> None:
-        """Test formatting hours, minutes, and seconds."""
-        assert format_duration(3600) == "1h 0m 0s"
-        assert format_duration(3661) == "1h 1m 1s"
-        assert format_duration(7325) == "2h 2m 5s"
+    def test_lookalike_host_keeps_query(self) -> None:
+        """Test hosts merely ending in a YouTube domain are not treated as YouTube."""
+        assert normalize_url("https://notyoutube.com/watch?v=test&id=1") == (
+            "https://notyoutube.com/watch?v=test&id=1"
+        )
 
-    def test_zero_duration(self) -> None:
-        """Test zero duration."""
-        assert format_duration(0) == "0s"
 
-    def test_large_duration(self) -> None:
-        """Test large duration."""
-        assert format_duration(3661) == "1h 1m 1s"
-        assert format_duration(86400) == "24h 0m 0s"
+class TestGetConsole:
+    """Test shared console access."""
 
+    def test_shared_instance(self) -> None:
+        """Test the same console is returned on every call."""
+        assert get_console() is get_console()
 
-class TestFormatFileSize:
-    """Test file size formatting."""
 
-    def test_bytes(self) -> None:
-        """Test bytes formatting."""
-        assert format_file_size(0) == "0.0 B"
-        assert format_file_size(512) == "512.0 B"
-        assert format_file_size(1023) == "1023.0 B"
+class TestFormatDuration:
+    """Test duration formatting."""
 
-    def test_kilobytes(self) -> None:
-        """Test kilobytes formatting."""
-        assert format_file_size(1024) == "1.0 KB"
-        assert format_file_size(1536) == "1.5 KB"
-        assert format_file_size(2048) == "2.0 KB"
+    def test_durations(self) -> None:
+        """Test seconds, minutes and hours formatting."""
+        cases = [
+            (0, "0s"),
+            (30, "30s"),
+            (59, "59s"),
+            (60, "1m 0s"),
+            (90, "1m 30s"),
+            (3599, "59m 59s"),
+            (3600, "1h 0m 0s"),
+            (3661, "1h 1m 1s"),
+            (7325, "2h 2m 5s"),
+            (86400, "24h 0m 0s"),
+        ]
+        
+        for seconds, expected in cases:
+            assert format_duration(seconds) == expected, seconds
 
-    def test_megabytes(self) -> None:
-        """Test megabytes formatting."""
-        assert format_file_size(1024 * 1024) == "1.0 MB"
-        assert format_file_size(1024 * 1024 * 2.5) == "2.5 MB"
 
-    def test_gigabytes(self) -> None:
-        """Test gigabytes formatting."""
-        assert format_file_size(1024 * 1024 * 1024) == "1.0 GB"
-        assert format_file_size(1024 * 1024 * 1024 * 5) == "5.0 GB"
+class TestFormatFileSize:
+    """Test file size formatting."""
 
-    def test_terabytes(self) -> None:
-        """Test terabytes formatting."""
-        assert format_file_size(1024 * 1024 * 1024 * 1024) == "1.0 TB"
+    def test_units(self) -> None:
+        """Test formatting across byte units."""
+        cases = [
+            (0, "0.0 B"),
+            (512, "512.0 B"),
+            (1023, "1023.0 B"),
+            (1024, "1.0 KB"),
+            (1536, "1.5 KB"),
+            (2048, "2.0 KB"),
+            (1024 * 1024, "1.0 MB"),
+            (1024 * 1024 * 2.5, "2.5 MB"),
+            (1024 * 1024 * 1024, "1.0 GB"),
+            (1024 * 1024 * 1024 * 5, "5.0 GB"),
+            (1024 * 1024 * 1024 * 1024, "1.0 TB"),
+        ]
+        
+        for size, expected in cases:
+            assert format_file_size(size) == expected, size
 
 
 class TestSanitizeFilename:
@@ -143,27 +215,37 @@ class TestSanitizeFilename:
 
     def test_invalid_characters(self) -> None:
         """Test removal of invalid characters."""
-        assert sanitize_filename("test<file.mp4") == "test_file.mp4"
-        assert sanitize_filename("test>file.mp4") == "test_file.mp4"
-        assert sanitize_filename("test:file.mp4") == "test_file.mp4"
-        assert sanitize_filename("test\"file.mp4") == "test_file.mp4"
-        assert sanitize_filename("test/file.mp4") == "test_file.mp4"
-        assert sanitize_filename("test\\file.mp4") == "test_file.mp4"
-        assert sanitize_filename("test|file.mp4") == "test_file.mp4"
-        assert sanitize_filename("test?file.mp4") == "test_file.mp4"
-        assert sanitize_filename("test*file.mp4") == "test_file.mp4"
+        for char in '<>:"/\\|?*':
+            assert sanitize_filename(f"test{char}file.mp4") == "test_file.mp4", char
 
     def test_control_characters(self) -> None:
         """Test removal of control characters."""
         assert sanitize_filename("test\x00file.mp4") == "testfile.mp4"
         assert sanitize_filename("test\x01file.mp4") == "testfile.mp4"
 
+    def test_all_control_characters(self) -> None:
+        """Test every control character except tab and newlines is dropped."""
+        controls = "".join(chr(code) for code in range(32))
+        assert sanitize_filename(f"a{controls}b") == "a\t\n\rb"
+
     def test_length_limit(self) -> None:
         """Test filename length limit."""
         long_name = "a" * 250
         result = sanitize_filename(long_name)
         assert len(result) == 200
 
+    def test_length_limit_boundaries(self) -> None:
+        """Test names at and around the length limit."""
+        test_cases = [
+            (199, 199),
+            (200, 200),
+            (201, 200),
+            (1000, 200),
+        ]
+
+        for length, expected in test_cases:
+            assert len(sanitize_filename("a" * length)) == expected
+
     def test_leading_trailing_spaces(self) -> None:
         """Test removal of leading/trailing spaces and dots."""
         assert sanitize_filename(" test.mp4 ") == "test.mp4"
@@ -206,6 +288,17 @@ class TestCreateOutputPath:
         )
         assert result == Path("/tmp/20231201 - Test Video.mp4")
 
+    def test_placeholder_in_title_not_expanded(self) -> None:
+        """Test template fields inside substituted values stay literal."""
+        result = create_output_path(
+            Path("/tmp"),
+            "%(title)s.%(ext)s",
+            "Clip %(uploader)s",
+            "mp4",
+            uploader="Test User"
+        )
+        assert result == Path("/tmp/Clip %(uploader)s.mp4")
+
     def test_extension_handling(self) -> None:
         """Test extension handling."""
         result = create_output_path(
@@ -227,6 +320,68 @@ class TestCreateOutputPath:
         assert result == Path("/tmp/Test Video.mp4.mp4")
 
 
+class TestBuildFormatRows:
+    """Test format table row building."""
+
+    def test_rows(self) -> None:
+        """Test rows are limited, sized and have long notes truncated."""
+        formats = [
+            {"format_id": str(i), "ext": "mp4", "filesize": 1024, "format_note": "n" * 25}
+            for i in range(20)
+        ]
+
+        rows = build_format_rows(formats)
+
+        assert len(rows) == 15
+        assert rows[0] == ("0", "mp4", "unknown", "1.0 KB", "unknown", "n" * 17 + "...")
+        assert build_format_rows([{}]) == [
+            ("unknown", "unknown", "unknown", "Unknown", "unknown", "")
+        ]
+
+
+class TestDisplayFormatsTable:
+    """Test formats table display."""
+
+    def test_quiet_console_skipped(self) -> None:
+        """Test nothing is built for a quiet console."""
+        console = Mock(quiet=True)
+        display_formats_table([{"format_id": "best"}], console=console)
+        console.print.assert_not_called()
+
+    def test_rows_printed(self) -> None:
+        """Test formats are printed as one table."""
+        console = Mock(quiet=False)
+        display_formats_table([{"format_id": "best", "filesize": 1024}], console=console)
+        table = console.print.call_args[0][0]
+        assert table.row_count == 1
+
+
+class TestDisplayVideoInfoTable:
+    """Test video info table display."""
+
+    def test_rows_printed(self) -> None:
+        """Test every property gets a row."""
+        console = Mock(quiet=False)
+        video_info = Mock(
+            title="Test Video",
+            uploader="Test User",
+            duration=120,
+            upload_date="20231201",
+            view_count=1000,
+            url="https://youtube.com/watch?v=test",
+            is_playlist=False,
+        )
+        display_video_info_table(video_info, console=console)
+        table = console.print.call_args[0][0]
+        assert table.row_count == 7
+
+    def test_quiet_console_skipped(self) -> None:
+        """Test nothing is built for a quiet console."""
+        console = Mock(quiet=True)
+        display_video_info_table(Mock(), console=console)
+        console.print.assert_not_called()
+
+
 class TestIsPlaylistUrl:
     """Test playlist URL detection."""
 
@@ -256,6 +411,10 @@ class TestIsPlaylistUrl:
         for url in non_playlist_urls:
             assert is_playlist_url(url) is False
 
+    def test_indicators_case_insensitive(self) -> None:
+        """Test indicators match regardless of case."""
+        assert is_playlist_url("https://YouTube.com/PLAYLIST?LIST=PL123") is True
+
 
 class TestExtractPlaylistId:
     """Test playlist ID extraction."""
@@ -284,6 +443,27 @@ class TestExtractPlaylistId:
         result = extract_playlist_id(url)
         assert result is None
 
+    def test_list_param_on_other_host(self) -> None:
+        """Test list parameters outside YouTube are not playlist IDs."""
+        assert extract_playlist_id("https://example.com/video?list=PL123") is None
+
+    def test_youtube_mentioned_outside_host(self) -> None:
+        """Test YouTube in the query or userinfo does not count as the host."""
+        urls = [
+            "https://evil.example/?u=youtube.com&list=X",
+            "https://evil.example/youtube.com?list=X",
+            "https://youtube.com@evil.example/?list=X",
+            "https://youtube.com.evil.example/?list=X",
+        ]
+
+        for url in urls:
+            assert extract_playlist_id(url) is None
+
+    def test_youtube_subdomain(self) -> None:
+        """Test playlist IDs on YouTube subdomains."""
+        assert extract_playlist_id("https://m.youtube.com/playlist?list=PL123") == "PL123"
+        assert extract_playlist_id("https://www.YouTube.com/watch?v=1&list=PL123") == "PL123"
+
     def test_other_platforms(self) -> None:
         """Test other platforms (should return None)."""
         url = "https://vimeo.com/123456"
@@ -294,17 +474,27 @@ class TestExtractPlaylistId:
 class TestValidateOutputPath:
     """Test output path validation."""
 
-    def test_valid_output_path(self) -> None:
+    def test_valid_output_path(self, tmp_path) -> None:
         """Test valid output path."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir) / "test.mp4"
-            assert validate_output_path(path) is True
+        path = tmp_path / "test.mp4"
+        assert validate_output_path(path) is True
 
-    def test_nonexistent_parent_directory(self) -> None:
+    def test_nonexistent_parent_directory(self, tmp_path) -> None:
         """Test path with nonexistent parent directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir) / "nonexistent" / "test.mp4"
-            assert validate_output_path(path) is True  # Should create directory
+        path = tmp_path / "nonexistent" / "test.mp4"
+        assert validate_output_path(path) is True  # Should create directory
+
+    def test_strict_probe(self, tmp_path) -> None:
+        """Test strict validation writes and removes a probe file."""
+        path = tmp_path / "test.mp4"
+        assert validate_output_path(path, strict=True) is True
+        assert list(tmp_path.iterdir()) == []
+
+    def test_access_denied(self, tmp_path) -> None:
+        """Test a directory reported unwritable is rejected."""
+        path = tmp_path / "test.mp4"
+        with patch("ytdl_helper.utils.os.access", return_value=False):
+            assert validate_output_path(path) is False
 
     def test_unwritable_directory(self) -> None:
         """Test unwritable directory."""